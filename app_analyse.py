@@ -0,0 +1,287 @@
+"""The Streamlit app's report views for one competition and target nation.
+
+Each tab has its own render function, defined once per process rather than
+on every rerun of the app script.
+"""
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+import season_store
+from extraction import (
+    DEFAULT_NATION,
+    ENTRANT_LABELS,
+    build_overview_data,
+    competition_nations,
+    nation_names,
+    nation_view,
+    summarise_competition,
+)
+from report_cache import file_digest, report_cache
+
+TAB_NAMES = ["Overview", "Nation Overview", "Tables", "Review", "Final Rankings", "Season Statistics"]
+# Rows of a stage table shown per page of the Tables tab
+TABLE_PAGE_SIZES = (25, 50, 100, 250)
+DEFAULT_PAGE_SIZE = 100
+
+
+# ---------------------------
+# Nation and Summary
+# ---------------------------
+def select_nation(competition):
+    # The report can target any nation; extraction already indexed them all
+    nations = competition_nations(competition)
+    return st.sidebar.selectbox(
+        "Target Nation", nations,
+        index=nations.index(DEFAULT_NATION) if DEFAULT_NATION in nations else 0
+    ) or DEFAULT_NATION
+
+
+def summarise(competition, file_hash, nation, live=None, timer=None):
+    with timer.stage("summarise_competition"):
+        return report_cache.get_or_compute(
+            (file_hash, "summary", nation),
+            lambda: live.summary(nation) if live is not None else summarise_competition(competition, nation)
+        )
+
+
+def overview_for(competition, summary):
+    return build_overview_data(competition["info"], summary["num_teams"], summary["num_countries"])
+
+
+# ---------------------------
+# Tabs
+# ---------------------------
+def render_overview(competition, summary, overview_data, target_nation):
+    nation_name, nation_adjective = nation_names(target_nation)
+    final_rankings_df = competition["final_rankings_df"]
+    nation_fencers_df = summary["nation_fencers_df"]
+    team_count_df = summary["team_count_df"]
+    # Individual events count and rank fencers rather than teams
+    individual = summary["kind"] == "individual"
+    entrants = ENTRANT_LABELS[summary["kind"]]
+
+    st.header(f"{overview_data['Year']} - {overview_data['Tournament']} - {overview_data['Championship']}")
+    st.subheader(f"Date: {overview_data['Date']}, Location: {overview_data['Location']}")
+    st.subheader(f"Category: {overview_data['Category']}, Weapon: {overview_data['Weapon']}, "
+                 f"Gender: {overview_data['Gender']}")
+    st.markdown("---")
+    nation_ranking = final_rankings_df[final_rankings_df['Nation'] == target_nation]
+    if not nation_ranking.empty:
+        nation_final_rank = nation_ranking.iloc[0]['Final Rank']
+        if individual:
+            st.subheader(f"The best placed {nation_adjective} fencer, {nation_ranking.iloc[0]['Name']}, "
+                         f"finished {nation_final_rank}.")
+        else:
+            st.subheader(f"The {nation_name} team achieved a final ranking of {nation_final_rank}.")
+    elif individual:
+        st.subheader(f"No final ranking data available for {nation_adjective} fencers.")
+    else:
+        st.subheader(f"No final ranking data available for the {nation_name} team.")
+    if not nation_fencers_df.empty:
+        st.markdown(f"### {nation_adjective} Fencers who participated")
+        st.table(nation_fencers_df)
+    else:
+        st.write(f"No {nation_adjective} fencers found in this competition.")
+    st.markdown("---")
+    st.subheader(f"**Number of {entrants}:** {summary['num_teams']}")
+    st.subheader(f"**Number of Countries:** {summary['num_countries']}")
+    st.markdown(f"### Number of {entrants} per Country")
+    # Countries run down each of the four columns in turn
+    num_columns = 4
+    rows = (len(team_count_df) + num_columns - 1) // num_columns
+    countries = team_count_df.iloc[:, 0].tolist()
+    counts = team_count_df.iloc[:, 1].tolist()
+    for col_idx, col in enumerate(st.columns(num_columns)):
+        for index in range(col_idx * rows, min((col_idx + 1) * rows, len(countries))):
+            col.metric(countries[index], counts[index])
+
+
+def render_nation_overview(competition):
+    selected_nation = st.selectbox("Select a Nation", competition_nations(competition))
+    if selected_nation:
+        fencer_dict = competition["fencer_dict"]
+        fencer_data = [fencer_dict[fencer_id] for fencer_id in nation_view(competition, selected_nation)["fencers"]]
+        if fencer_data:
+            st.dataframe(pd.DataFrame(fencer_data), hide_index=True)
+        else:
+            st.write(f"No fencers found for {selected_nation}.")
+
+
+def table_page(frame, page, page_size):
+    # Rows of a 1-based page
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size]
+
+
+def render_tables(summary):
+    # One stage and one page of it are sent to the browser per run, sliced
+    # from the summary's cached stage frames
+    tables_data = summary["tables_data"]
+    if not tables_data:
+        st.write("No stage tables available.")
+        return
+    stage_col, size_col = st.columns([3, 1])
+    stage_title = stage_col.selectbox(
+        "Stage", list(tables_data), format_func=lambda title: f"{title} ({len(tables_data[title])} rows)"
+    )
+    page_size = size_col.selectbox("Rows per page", TABLE_PAGE_SIZES, index=TABLE_PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
+    matches = tables_data[stage_title]
+    num_pages = max(1, (len(matches) + page_size - 1) // page_size)
+    page = 1
+    if num_pages > 1:
+        page = st.number_input(
+            f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1,
+            key=f"tables_page:{stage_title}:{page_size}"
+        )
+    st.subheader(f"Stage: {stage_title}")
+    st.dataframe(table_page(matches, page, page_size), hide_index=True)
+    if num_pages > 1:
+        start = (page - 1) * page_size
+        st.caption(f"Rows {start + 1}-{min(start + page_size, len(matches))} of {len(matches)}")
+
+
+def render_review(summary, target_nation):
+    poule_indicators = summary["poule_indicators"]
+    nation_summary = summary["nation_summary"]
+    if not poule_indicators.empty:
+        st.markdown("### Poule Indicators")
+        st.dataframe(poule_indicators, hide_index=True)
+    if nation_summary:
+        for fencer_data in nation_summary:
+            st.markdown(f"### Fencer: {fencer_data['Fencer']}")
+            st.write(f"Scored: {fencer_data['Scored']}, Conceded: {fencer_data['Conceded']}, Total: {fencer_data['Total']}")
+            if not fencer_data['Outcomes'].empty:
+                st.table(fencer_data['Outcomes'])
+            else:
+                st.write("No match outcome data available for this fencer.")
+    else:
+        st.write(f"No match outcome data available for {nation_names(target_nation)[1]} fencers.")
+
+
+def highlight_nation(row, nation):
+    return ['background-color: yellow' if row['Nation'] == nation else '' for _ in row]
+
+
+def render_rankings(competition, target_nation):
+    final_rankings_df = competition["final_rankings_df"]
+    st.header("Final Rankings")
+    if not final_rankings_df.empty:
+        st.dataframe(final_rankings_df.style.apply(highlight_nation, axis=1, nation=target_nation))
+    else:
+        st.write("No final rankings data available.")
+
+
+def season_connection():
+    # One store connection per session, opened the first time the tab's
+    # content is asked for rather than on every rerun
+    if "season_db" not in st.session_state:
+        st.session_state["season_db"] = season_store.connect(check_same_thread=False)
+    return st.session_state["season_db"]
+
+
+def close_season_connection():
+    season_db = st.session_state.pop("season_db", None)
+    if season_db is not None:
+        season_db.close()
+
+
+def render_season(target_nation, read_source):
+    # read_source() returns the results file's bytes for ingestion
+    st.header("Season Statistics")
+    # Career figures come from the SQLite store, built up one upload at a time;
+    # it is only opened (and created) once asked for
+    if not st.toggle("Open the season store", key="season_open"):
+        close_season_connection()
+        st.write(f"The season store is kept in {season_store.DEFAULT_DB_PATH}.")
+        return
+    season_db = season_connection()
+    try:
+        render_season_store(season_db, target_nation, read_source)
+    except Exception:
+        # A failed query may leave the connection mid-transaction; the next
+        # run opens a fresh one
+        close_season_connection()
+        raise
+
+
+def render_season_store(season_db, target_nation, read_source):
+    nation_adjective = nation_names(target_nation)[1]
+    if st.button("Add this competition to the season store"):
+        file_bytes = read_source()
+        try:
+            competition_id = season_store.ingest_competition(
+                season_db, BytesIO(file_bytes), file_hash=file_digest(file_bytes)
+            )
+            st.success(f"Stored competition {competition_id}.")
+        except ValueError as e:
+            st.error(str(e))
+    stored = season_store.list_competitions(season_db)
+    if stored.empty:
+        st.write("The season store is empty.")
+        return
+    st.write(f"{len(stored)} competitions stored.")
+    career_df = season_store.fencer_career_stats(season_db, target_nation)
+    if career_df.empty:
+        st.write(f"No stored bouts for {nation_adjective} fencers.")
+        return
+    st.subheader(f"{nation_adjective} Fencers")
+    st.dataframe(career_df, hide_index=True)
+    st.subheader("Win Rate by Opponent Nation")
+    # Keyed by fencer ID: two fencers may share a name
+    fencer_names = dict(zip(career_df["Fencer ID"], career_df["Name"]))
+    fencer_id = st.selectbox(
+        "Fencer", [None] + list(fencer_names),
+        format_func=lambda option: "All fencers" if option is None else f"{fencer_names[option]} ({option})"
+    )
+    st.dataframe(
+        season_store.win_rate_by_opponent_nation(season_db, fencer_id=fencer_id, nation=target_nation),
+        hide_index=True,
+    )
+    st.subheader("Team Results")
+    st.dataframe(season_store.nation_results(season_db, target_nation), hide_index=True)
+    render_head_to_head(season_db, target_nation, fencer_id)
+
+
+def render_head_to_head(season_db, target_nation, fencer_id):
+    # Read from the store's precomputed pair totals, for all stored competitions
+    st.subheader("Head-to-Head")
+    if fencer_id is None:
+        opponent_options = ["All nations"] + [
+            nation for nation in season_store.list_nations(season_db) if nation != target_nation
+        ]
+        opponent_nation = st.selectbox("Opponent nation", opponent_options)
+        st.dataframe(
+            season_store.nation_head_to_head(
+                season_db, target_nation, None if opponent_nation == "All nations" else opponent_nation
+            ),
+            hide_index=True,
+        )
+        return
+    opponents_df = season_store.fencer_head_to_head(season_db, fencer_id)
+    st.dataframe(opponents_df, hide_index=True)
+    if opponents_df.empty:
+        return
+    opponent_labels = {
+        opponent_id: f"{name} ({nation}, {opponent_id})"
+        for opponent_id, name, nation in zip(opponents_df["Opponent ID"], opponents_df["Opponent"], opponents_df["Nation"])
+    }
+    opponent_id = st.selectbox("Opponent", list(opponent_labels), format_func=opponent_labels.get)
+    st.dataframe(season_store.pair_bouts(season_db, fencer_id, opponent_id), hide_index=True)
+
+
+def render_tabs(competition, summary, overview_data, target_nation, read_source, timer):
+    tabs = st.tabs(TAB_NAMES)
+    with tabs[0], timer.stage("render: Overview"):
+        render_overview(competition, summary, overview_data, target_nation)
+    with tabs[1], timer.stage("render: Nation Overview"):
+        render_nation_overview(competition)
+    with tabs[2], timer.stage("render: Tables"):
+        render_tables(summary)
+    with tabs[3], timer.stage("render: Review"):
+        render_review(summary, target_nation)
+    with tabs[4], timer.stage("render: Final Rankings"):
+        render_rankings(competition, target_nation)
+    with tabs[5], timer.stage("render: Season Statistics"):
+        render_season(target_nation, read_source)
@@ -0,0 +1,68 @@
+"""The Streamlit app's Word report download in the sidebar.
+
+python-docx is only imported when a document is first built locally in
+this process.
+"""
+import streamlit as st
+
+from extraction import REPORT_SECTIONS
+from render_service import SERVICE_URL, RenderError, request_report
+from report_cache import report_cache
+
+
+def _service_report(file_bytes, target_nation, sections, timer):
+    # The shared render service builds each distinct report once for every
+    # session asking for it
+    with st.spinner("Requesting Word document..."), timer.stage("export_to_word: service"):
+        try:
+            return request_report(file_bytes, target_nation, sections)
+        except (RenderError, OSError) as e:
+            st.error(f"Report service failed: {e}")
+    return None
+
+
+def _local_report(competition, summary, overview_data, sections, timer):
+    progress_bar = st.progress(0.0, text="Building Word document...")
+    with timer.stage("export_to_word: import"):
+        from word_export import export_competition_report
+    with timer.stage("export_to_word"):
+        word_bytes = export_competition_report(
+            competition, summary, overview_data, progress=progress_bar.progress, timer=timer,
+            sections=sections
+        ).getvalue()
+    progress_bar.empty()
+    return word_bytes
+
+
+def render_download(competition, summary, overview_data, target_nation, file_hash, read_source, timer):
+    # read_source() returns the results file's bytes for the render service
+    with st.sidebar:
+        st.header("Download Report")
+        # The document is only built when asked for, then kept in the cache
+        # for this upload and nation so later reruns can offer it directly.
+        sections = tuple(st.multiselect("Sections", REPORT_SECTIONS, default=REPORT_SECTIONS,
+                                        format_func=str.title)) or REPORT_SECTIONS
+        report_key = (file_hash, "docx", target_nation, sections)
+        word_bytes = report_cache.get(report_key)
+        if word_bytes is None and st.button("Generate Word Document"):
+            if SERVICE_URL:
+                word_bytes = _service_report(read_source(), target_nation, sections, timer)
+            else:
+                word_bytes = _local_report(competition, summary, overview_data, sections, timer)
+            if word_bytes is not None:
+                report_cache.put(report_key, word_bytes)
+
+        if word_bytes is not None:
+            st.download_button(
+                label="Download Word Document",
+                data=word_bytes,
+                file_name=f"Competition_Report_{target_nation}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
+
+        cache_stats = report_cache.stats()
+        st.caption(
+            f"Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['entries']}/{cache_stats['max_entries']} entries, "
+            f"{cache_stats['bytes'] / 2**20:.1f}/{cache_stats['max_bytes'] / 2**20:.0f} MB"
+        )
@@ -0,0 +1,56 @@
+"""Loading a results file for the Streamlit app.
+
+Uploads go through the snapshot store; watched files through a live
+engine kept in the session. rudy_report_with_word imports this module once
+a file has been chosen, so the upload page does not load the extraction
+stack.
+"""
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import streamlit as st
+
+from snapshot import load_or_extract
+
+
+def parse_xml(file_bytes, file_hash, timer):
+    # Loads the stored snapshot of a file seen before; otherwise streams the
+    # upload, extracts every report structure in one pass and stores them
+    try:
+        with timer.stage("parse_xml") as counts:
+            counts["bytes"] = len(file_bytes)
+            return load_or_extract(file_bytes, file_hash, timer=timer)
+    except UnicodeDecodeError:
+        st.error("Encoding issue: Ensure the file is saved as UTF-8.")
+    except ET.ParseError as e:
+        st.error(f"XML Parsing Error: {e}")
+    return None
+
+
+def watched_competition(path):
+    # One live engine per watched path, kept across reruns of this session
+    from live_watch import LiveCompetition
+
+    engines = st.session_state.setdefault("live_competitions", {})
+    key = os.path.abspath(path)
+    if key not in engines:
+        engines[key] = LiveCompetition(key)
+    return engines[key]
+
+
+def watch_status(live, source_name):
+    # Run as a fragment every few seconds: a full rerun once the file changes
+    if live.file_changed():
+        st.rerun()
+    if live.last_refresh is not None:
+        updated = datetime.fromtimestamp(live.last_refresh).strftime("%H:%M:%S")
+        st.caption(f"Watching {source_name}: {len(live.matches)} matches, updated {updated}")
+
+
+def source_bytes(live, file_bytes):
+    # The uploaded bytes, or the watched file as it is now
+    if live is None:
+        return file_bytes
+    with open(live.path, "rb") as handle:
+        return handle.read()
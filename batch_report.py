@@ -0,0 +1,171 @@
+"""Render Word reports for many competition XML files without Streamlit.
+
+    python batch_report.py results/ "archive/2024-*.xml" -o reports -j 8
+
+Each input is a directory (all *.xml files in it) or a glob pattern. One
+.docx per file is written to the output directory using the same
+extraction and export_to_word code as the app, in a pool of worker
+processes. Per-file timings and failures are printed as they finish, and
+the exit status is non-zero if any file failed.
+
+Reports target --nation (default QAT). With --all-nations every nation in
+a file gets its own <name>_<NATION>.docx from that file's single
+extraction pass.
+
+Files already seen are loaded from their columnar snapshot (see
+snapshot.py) instead of being parsed; a file without one is extracted for
+every nation and its snapshot stored. --no-snapshots parses every file
+for the requested nation only.
+
+--backend template writes the .docx through the streamed template backend
+(see docx_template.py) instead of python-docx; the documents are the same.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from extraction import (
+    DEFAULT_NATION,
+    build_overview_data,
+    competition_nations,
+    extract_competition,
+    summarise_competition,
+)
+from snapshot import SNAPSHOT_DIR, load_or_extract
+from word_export import DEFAULT_BACKEND, WORD_BACKENDS, export_competition_report
+
+
+# ---------------------------
+# Input Discovery
+# ---------------------------
+def find_xml_files(inputs):
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.xml"))
+        else:
+            matches = glob.glob(pattern)
+        paths.extend(sorted(matches))
+    # Keep the first occurrence of files matched by several inputs
+    return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+
+def report_paths(xml_paths, output_dir):
+    # Files with the same name from different directories get a numeric suffix
+    outputs = {}
+    used = set()
+    for xml_path in xml_paths:
+        stem = os.path.splitext(os.path.basename(xml_path))[0]
+        name, counter = stem, 1
+        while name in used:
+            counter += 1
+            name = f"{stem}_{counter}"
+        used.add(name)
+        outputs[xml_path] = os.path.join(output_dir, name)
+    return outputs
+
+
+# ---------------------------
+# Per-File Worker
+# ---------------------------
+def render_report(xml_path, output_stem, nation=DEFAULT_NATION, snapshot_dir=SNAPSHOT_DIR, backend=DEFAULT_BACKEND):
+    """Parse one file and write its report(s); returns per-stage timings.
+
+    ``nation=None`` writes one report per nation in the file.
+    ``snapshot_dir=None`` always parses the XML.
+    """
+    started = time.perf_counter()
+    if snapshot_dir is None:
+        competition = extract_competition(xml_path, nations=None if nation is None else [nation])
+    else:
+        with open(xml_path, "rb") as handle:
+            competition = load_or_extract(handle.read(), snapshot_dir=snapshot_dir)
+    parsed = time.perf_counter()
+    if nation is None:
+        targets = [(target, f"{output_stem}_{target}.docx") for target in competition_nations(competition)]
+    else:
+        targets = [(nation, f"{output_stem}.docx")]
+    for target, output_path in targets:
+        summary = summarise_competition(competition, target)
+        overview_data = build_overview_data(competition["info"], summary["num_teams"], summary["num_countries"])
+        buffer = export_competition_report(competition, summary, overview_data, backend=backend)
+        with open(output_path, "wb") as handle:
+            handle.write(buffer.getvalue())
+    finished = time.perf_counter()
+    return {
+        "parse": parsed - started,
+        "export": finished - parsed,
+        "total": finished - started,
+        "reports": len(targets),
+    }
+
+
+def run_batch(xml_paths, output_dir, workers=None, nation=DEFAULT_NATION, snapshot_dir=SNAPSHOT_DIR,
+              backend=DEFAULT_BACKEND):
+    """Render every file; returns (results, failures) keyed by input path."""
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    failures = {}
+    outputs = report_paths(xml_paths, output_dir)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(render_report, path, outputs[path], nation, snapshot_dir, backend): path
+            for path in xml_paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            name = os.path.basename(path)
+            try:
+                timings = future.result()
+            except Exception as e:
+                failures[path] = f"{type(e).__name__}: {e}"
+                print(f"FAILED {name}: {failures[path]}", flush=True)
+                continue
+            results[path] = timings
+            print(
+                f"ok     {name}: parse {timings['parse']:.2f}s, export {timings['export']:.2f}s "
+                f"({timings['reports']} reports), total {timings['total']:.2f}s",
+                flush=True,
+            )
+    return results, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Word reports for Ophardt competition XML files.")
+    parser.add_argument("inputs", nargs="+", help="directories of .xml files or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="reports", help="where to write the .docx files (default: reports)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--nation", default=DEFAULT_NATION,
+                        help=f"nation code the reports are written for (default: {DEFAULT_NATION})")
+    target.add_argument("--all-nations", action="store_true", help="write a report for every nation in each file")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR,
+                        help=f"where parsed competitions are stored for reuse (default: {SNAPSHOT_DIR})")
+    parser.add_argument("--no-snapshots", action="store_true", help="parse every file, without reading or writing snapshots")
+    parser.add_argument("--backend", choices=WORD_BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"how the .docx files are written (default: {DEFAULT_BACKEND})")
+    args = parser.parse_args(argv)
+
+    xml_paths = find_xml_files(args.inputs)
+    if not xml_paths:
+        parser.error("no XML files matched the given inputs")
+
+    started = time.perf_counter()
+    nation = None if args.all_nations else args.nation.upper()
+    snapshot_dir = None if args.no_snapshots else args.snapshot_dir
+    results, failures = run_batch(xml_paths, args.output_dir, args.workers, nation, snapshot_dir, args.backend)
+    elapsed = time.perf_counter() - started
+    reports = sum(timings["reports"] for timings in results.values())
+    print(
+        f"\n{reports} reports for {len(results)} files written to {args.output_dir}, {len(failures)} failed, "
+        f"{elapsed:.2f}s with {args.workers} workers"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
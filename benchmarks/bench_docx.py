@@ -0,0 +1,78 @@
+"""Word export backends: python-docx objects against the streamed template.
+
+For each synthetic size, builds the full report (all stages, review and
+rankings) for one nation with both word_export backends and prints the
+best time, the peak Python-heap allocation (tracemalloc; lxml's own
+element memory is not traced, so python-docx's figure is a lower bound)
+and the .docx size, then checks that both packages hold the same parts.
+
+    python benchmarks/bench_docx.py
+    python benchmarks/bench_docx.py --preset large --nation QAT --rounds 5
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from extraction import build_overview_data, extract_competition, summarise_competition  # noqa: E402
+from synthetic import PRESETS, generate_competition  # noqa: E402
+from word_export import WORD_BACKENDS, export_competition_report  # noqa: E402
+
+DEFAULT_PRESETS = ("medium", "large")
+ROUNDS = 3
+
+
+def package_parts(buffer):
+    with zipfile.ZipFile(buffer) as package:
+        return [(info.filename, package.read(info)) for info in package.infolist()]
+
+
+def run_backend(competition, summary, overview_data, backend, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        buffer = export_competition_report(competition, summary, overview_data, backend=backend)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    export_competition_report(competition, summary, overview_data, backend=backend)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), python_peak, buffer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the Word export backends.")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS),
+                        help=f"synthetic size, repeatable (default: {', '.join(DEFAULT_PRESETS)})")
+    parser.add_argument("--nation", default="QAT", help="nation the report is for (default: QAT)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"timed runs per backend (default: {ROUNDS})")
+    args = parser.parse_args(argv)
+
+    print(f"{'input':<8} {'rows':>7} {'backend':<12} {'best s':>8} {'py MB':>8} {'docx KB':>9} {'speedup':>8}")
+    for preset in args.preset or DEFAULT_PRESETS:
+        num_teams, repeats = PRESETS[preset]
+        competition = extract_competition(io.BytesIO(generate_competition(num_teams=num_teams, repeats=repeats)))
+        summary = summarise_competition(competition, args.nation)
+        overview_data = build_overview_data(competition["info"], summary["num_teams"], summary["num_countries"])
+        rows = sum(len(table) for table in summary["tables_data"].values())
+        results = {
+            backend: run_backend(competition, summary, overview_data, backend, args.rounds)
+            for backend in WORD_BACKENDS
+        }
+        baseline = results["python-docx"][0]
+        for backend, (best, python_peak, buffer) in results.items():
+            print(f"{preset:<8} {rows:>7} {backend:<12} {best:>8.3f} {python_peak / 1e6:>8.1f} "
+                  f"{len(buffer.getvalue()) / 1024:>9.1f} {baseline / best:>7.1f}x")
+        parts = [package_parts(buffer) for _, _, buffer in results.values()]
+        print(f"{preset:<8} identical parts: {all(other == parts[0] for other in parts[1:])}")
+
+
+if __name__ == "__main__":
+    main()
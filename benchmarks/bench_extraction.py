@@ -0,0 +1,168 @@
+"""Single-pass extraction engine against the original ElementTree functions.
+
+Three comparisons per synthetic event:
+
+* extract: the original build_fencer_dict_and_team_dict,
+  extract_final_rankings and generate_tables_data on a parsed tree, against
+  one CompetitionExtractor pass over the loaded records, for QAT.
+* end to end: raw bytes to report structures, i.e. the whole-document parse
+  plus the original functions, against extraction.extract_competition.
+* all nations: the original generate_tables_data and Review tables run
+  once per nation, against one CompetitionExtractor pass indexing every
+  nation (all bouts go through the bulk frame) plus summarise_competition
+  per nation. Outputs are checked for each nation.
+
+    python benchmarks/bench_extraction.py
+"""
+import io
+import os
+import sys
+import time
+from collections import Counter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reference  # noqa: E402
+from extraction import CompetitionExtractor, extract_competition, summarise_competition  # noqa: E402
+from xml_loader import load_competition  # noqa: E402
+from synthetic import generate_competition  # noqa: E402
+
+# (teams, repeats) of the synthetic events
+SIZES = ((64, 1), (256, 4), (512, 24))
+ROUNDS = 3
+
+
+def reference_extract(root):
+    fencer_dict, team_dict = reference.build_fencer_dict_and_team_dict(root)
+    final_rankings_df = reference.extract_final_rankings(root, team_dict)
+    tables_data, accumulated_touches = reference.generate_tables_data(root, team_dict, fencer_dict)
+    # The Review section's per-fencer groupby is part of the original cost
+    for scores in accumulated_touches.values():
+        reference.outcome_summary_table(scores["matches"])
+    return fencer_dict, team_dict, final_rankings_df, tables_data, accumulated_touches
+
+
+def reference_pipeline(data):
+    return reference_extract(reference.parse_xml(data))
+
+
+def _outputs(result):
+    # The reference functions only cover the hardcoded "QAT" report
+    summary = summarise_competition(result, "QAT")
+    return (result["fencer_dict"], result["team_dict"], result["final_rankings_df"],
+            summary["tables_data"], summary["nation_summary"])
+
+
+def single_pass_extract(competition):
+    extractor = CompetitionExtractor(nations=["QAT"])
+    extractor.add("competition", competition["info"])
+    for team in competition["teams"]:
+        extractor.add_team(team)
+    for equipe in competition["rankings"]:
+        extractor.add_ranking(equipe)
+    for match in competition["matches"]:
+        extractor.add_match(match)
+    return _outputs(extractor.result())
+
+
+def single_pass(data):
+    return _outputs(extract_competition(io.BytesIO(data), nations=["QAT"]))
+
+
+def reference_all_nations(root):
+    fencer_dict, team_dict = reference.build_fencer_dict_and_team_dict(root)
+    final_rankings_df = reference.extract_final_rankings(root, team_dict)
+    by_nation = {}
+    for nation in sorted({team["Nation"] for team in team_dict.values()}):
+        tables_data, accumulated_touches = reference.generate_tables_data(root, team_dict, fencer_dict, nation)
+        for scores in accumulated_touches.values():
+            reference.outcome_summary_table(scores["matches"])
+        by_nation[nation] = (fencer_dict, team_dict, final_rankings_df, tables_data, accumulated_touches)
+    return by_nation
+
+
+def single_pass_all_nations(competition):
+    extractor = CompetitionExtractor()
+    extractor.add("competition", competition["info"])
+    for team in competition["teams"]:
+        extractor.add_team(team)
+    for equipe in competition["rankings"]:
+        extractor.add_ranking(equipe)
+    for match in competition["matches"]:
+        extractor.add_match(match)
+    result = extractor.result()
+    by_nation = {}
+    for nation in result["nations"]:
+        summary = summarise_competition(result, nation)
+        by_nation[nation] = (result["fencer_dict"], result["team_dict"], result["final_rankings_df"],
+                             summary["tables_data"], summary["nation_summary"])
+    return by_nation
+
+
+def same_all_nations(expected, actual):
+    return expected.keys() == actual.keys() and all(
+        same_outputs(expected[nation], actual[nation]) for nation in expected
+    )
+
+
+def _reference_review(accumulated_touches):
+    return [
+        (fencer, scores["scored"], scores["against"],
+         Counter((match["Opponent Team"], match["Outcome"]) for match in scores["matches"]))
+        for fencer, scores in accumulated_touches.items()
+    ]
+
+
+def _review(nation_summary):
+    review = []
+    for fencer_data in nation_summary:
+        counts = Counter()
+        for row in fencer_data["Outcomes"].itertuples(index=False):
+            for outcome, count in zip(("Victory", "Defeat", "Draw"), row[1:]):
+                if count:
+                    counts[(row[0], outcome)] = count
+        review.append((fencer_data["Fencer"], fencer_data["Scored"], fencer_data["Conceded"], counts))
+    return review
+
+
+def same_outputs(expected, actual):
+    fencers, teams, rankings, tables, touches = expected
+    new_tables = {stage: rows.to_dict("records") for stage, rows in actual[3].items()}
+    return (fencers == actual[0] and teams == actual[1] and rankings.equals(actual[2])
+            and dict(tables) == new_tables and _reference_review(touches) == _review(actual[4]))
+
+
+def best_time(func, arg):
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = func(arg)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    print(f"{'teams':>6} {'repeats':>7} {'bouts':>8} {'stage':<11} {'reference s':>12} {'single pass s':>14} {'speedup':>8}")
+    for num_teams, repeats in SIZES:
+        data = generate_competition(num_teams=num_teams, repeats=repeats)
+        bouts = data.count(b"<Assaut ")
+        root = reference.parse_xml(data)
+        competition = load_competition(io.BytesIO(data))
+        comparisons = (
+            ("extract", reference_extract, root, single_pass_extract, competition, same_outputs),
+            ("end to end", reference_pipeline, data, single_pass, data, same_outputs),
+            ("all nations", reference_all_nations, root, single_pass_all_nations, competition, same_all_nations),
+        )
+        for stage, ref_func, ref_input, new_func, new_input, same in comparisons:
+            ref_time, expected = best_time(ref_func, ref_input)
+            new_time, actual = best_time(new_func, new_input)
+            if not same(expected, actual):
+                raise SystemExit(f"Outputs differ for {num_teams} teams x {repeats} ({stage})")
+            print(f"{num_teams:>6} {repeats:>7} {bouts:>8} {stage:<11} {ref_time:>12.3f} "
+                  f"{new_time:>14.3f} {ref_time / new_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
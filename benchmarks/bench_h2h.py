@@ -0,0 +1,88 @@
+"""Head-to-head queries from season_store's pair tables against raw bouts.
+
+Ingests --competitions synthetic team events (the same fencer IDs meet
+again and again, as in a real season) into a temporary store, timing the
+ingestion, then times each head-to-head query from the precomputed tables
+and the same totals aggregated from fencer_bouts, and checks they agree.
+
+    python benchmarks/bench_h2h.py
+    python benchmarks/bench_h2h.py --competitions 2000 --teams 16
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import season_store  # noqa: E402
+from synthetic import generate_competition  # noqa: E402
+
+ROUNDS = 20
+# The same totals as the pair tables, aggregated from every stored bout
+RAW_QUERIES = {
+    "nation": """
+        SELECT opponent_nation, COUNT(DISTINCT competition_id), COUNT(*), SUM(scored), SUM(conceded),
+               SUM(outcome = 'Victory'), SUM(outcome = 'Defeat'), SUM(outcome = 'Draw')
+        FROM fencer_bouts WHERE nation = ? GROUP BY opponent_nation ORDER BY opponent_nation
+    """,
+    "fencer": """
+        SELECT opponent_id, COUNT(DISTINCT competition_id), COUNT(*), SUM(scored), SUM(conceded),
+               SUM(outcome = 'Victory'), SUM(outcome = 'Defeat'), SUM(outcome = 'Draw')
+        FROM fencer_bouts WHERE fencer_id = ? GROUP BY opponent_id ORDER BY opponent_id
+    """,
+}
+INDEX_QUERIES = {
+    "nation": f"SELECT opponent_nation, {', '.join(season_store.H2H_TOTALS)} FROM nation_h2h "
+              "WHERE nation = ? ORDER BY opponent_nation",
+    "fencer": f"SELECT opponent_id, {', '.join(season_store.H2H_TOTALS)} FROM fencer_h2h "
+              "WHERE fencer_id = ? ORDER BY opponent_id",
+}
+
+
+def best_time(func, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time head-to-head queries over a season store.")
+    parser.add_argument("--competitions", type=int, default=500, help="synthetic competitions to ingest (default: 500)")
+    parser.add_argument("--teams", type=int, default=16, help="teams per competition (default: 16)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"timed runs per query (default: {ROUNDS})")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = season_store.connect(os.path.join(tmp_dir, "season.sqlite"))
+        started = time.perf_counter()
+        for seed in range(args.competitions):
+            season_store.ingest_competition(conn, io.BytesIO(generate_competition(num_teams=args.teams, seed=seed)))
+        ingest_time = time.perf_counter() - started
+        bouts = conn.execute("SELECT COUNT(*) FROM fencer_bouts").fetchone()[0]
+        print(f"ingested {args.competitions} competitions ({bouts} bout rows) in {ingest_time:.2f}s, "
+              f"{1000 * ingest_time / args.competitions:.1f} ms each")
+        rebuild_time, _ = best_time(lambda: season_store.rebuild_head_to_head(conn), 1)
+        print(f"full rebuild of the pair tables: {rebuild_time:.2f}s")
+
+        subjects = {
+            "nation": conn.execute("SELECT nation FROM nation_h2h ORDER BY bouts DESC LIMIT 1").fetchone()[0],
+            "fencer": conn.execute("SELECT fencer_id FROM fencer_h2h ORDER BY bouts DESC LIMIT 1").fetchone()[0],
+        }
+        print(f"\n{'query':<8} {'raw ms':>9} {'index ms':>9} {'speedup':>8}  same")
+        for name, subject in subjects.items():
+            raw_time, raw = best_time(lambda: conn.execute(RAW_QUERIES[name], (subject,)).fetchall(), args.rounds)
+            index_time, indexed = best_time(lambda: conn.execute(INDEX_QUERIES[name], (subject,)).fetchall(), args.rounds)
+            print(f"{name:<8} {1000 * raw_time:>9.3f} {1000 * index_time:>9.3f} {raw_time / index_time:>7.1f}x  {raw == indexed}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Watch-mode update latency as a live event progresses.
+
+Writes a synthetic team event with no final ranks yet (as during the
+event) cut to the first 10%, 25%, 50% and 100% of its matches. For each,
+a LiveCompetition loads the file, then one match is rewritten and the
+times of refresh(), competition() and summary() are taken over --rounds
+such rewrites. The report structures are checked against a full
+extraction of the same file, for every nation.
+
+    python benchmarks/bench_live.py
+    python benchmarks/bench_live.py --preset medium --nation QAT
+"""
+import argparse
+import io
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from extraction import competition_nations, extract_competition, summarise_competition  # noqa: E402
+from live_watch import LiveCompetition, _match_spans  # noqa: E402
+from synthetic import PRESETS, generate_competition  # noqa: E402
+
+FRACTIONS = (0.1, 0.25, 0.5, 1.0)
+ROUNDS = 5
+FINAL_RANK = re.compile(rb'\s+RangFinal="[^"]*"')
+PISTE = re.compile(rb'Piste="[^"]*"')
+
+
+def live_file(data, fraction):
+    # The event as written after the first fraction of its matches
+    spans = list(_match_spans(data))
+    keep = max(1, int(len(spans) * fraction))
+    cut = [data[:spans[keep - 1][1]]]
+    previous_end = spans[keep - 1][1]
+    for start, end in spans[keep:]:
+        cut.append(data[previous_end:start])
+        previous_end = end
+    cut.append(data[previous_end:])
+    return b"".join(cut), spans[keep - 1]
+
+
+def rewrite(path, data, span, round_index):
+    # The last match written again with a different piste
+    start, end = span
+    with open(path, "wb") as handle:
+        handle.write(data[:start] + PISTE.sub(f'Piste="P{round_index}"'.encode(), data[start:end], 1) + data[end:])
+    # A new mtime even on filesystems with coarse timestamps
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + round_index + 1))
+
+
+def same_frame(live, full):
+    # Values only: the live engine builds str columns where the bulk engine
+    # keeps object ones
+    return (list(live.columns) == list(full.columns) and live.shape == full.shape
+            and bool((live.astype(object).to_numpy() == full.astype(object).to_numpy()).all()))
+
+
+def same_summary(live, full):
+    if list(live["tables_data"]) != list(full["tables_data"]):
+        return False
+    if not all(same_frame(live["tables_data"][stage], full["tables_data"][stage]) for stage in full["tables_data"]):
+        return False
+    if len(live["nation_summary"]) != len(full["nation_summary"]):
+        return False
+    for live_fencer, full_fencer in zip(live["nation_summary"], full["nation_summary"]):
+        if {key: value for key, value in live_fencer.items() if key != "Outcomes"} != \
+                {key: value for key, value in full_fencer.items() if key != "Outcomes"}:
+            return False
+        if not same_frame(live_fencer["Outcomes"], full_fencer["Outcomes"]):
+            return False
+    return same_frame(live["nation_fencers_df"], full["nation_fencers_df"]) and live["num_teams"] == full["num_teams"]
+
+
+def check(live, data):
+    # Every nation's report from the live state against a full extraction
+    full = extract_competition(io.BytesIO(data))
+    competition = live.competition()
+    if not same_frame(competition["final_rankings_df"], full["final_rankings_df"]):
+        return False
+    for nation in competition_nations(full):
+        if competition["nations"][nation]["matches"] != full["nations"][nation]["matches"]:
+            return False
+        if not same_summary(live.summary(nation), summarise_competition(full, nation)):
+            return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time watch-mode updates at several points of a live event.")
+    parser.add_argument("--preset", default="large", choices=sorted(PRESETS), help="synthetic size (default: large)")
+    parser.add_argument("--nation", default="QAT", help="nation summarised after each update (default: QAT)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"rewritten matches per point (default: {ROUNDS})")
+    args = parser.parse_args(argv)
+
+    num_teams, repeats = PRESETS[args.preset]
+    event = FINAL_RANK.sub(b"", generate_competition(num_teams=num_teams, repeats=repeats))
+    print(f"{'matches':>8} {'MB':>6} {'refresh s':>10} {'competition s':>14} {'summary s':>10}  same")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "live.xml")
+        for fraction in FRACTIONS:
+            data, last_span = live_file(event, fraction)
+            with open(path, "wb") as handle:
+                handle.write(data)
+            live = LiveCompetition(path)
+            live.refresh()
+            live.competition()
+            live.summary(args.nation)
+            timings = {"refresh": [], "competition": [], "summary": []}
+            for round_index in range(args.rounds):
+                rewrite(path, data, last_span, round_index)
+                started = time.perf_counter()
+                changes = live.refresh()
+                timings["refresh"].append(time.perf_counter() - started)
+                if not changes or changes["changed"] != 1:
+                    raise RuntimeError(f"expected one changed match, got {changes}")
+                for step, run in (("competition", live.competition), ("summary", lambda: live.summary(args.nation))):
+                    started = time.perf_counter()
+                    run()
+                    timings[step].append(time.perf_counter() - started)
+            with open(path, "rb") as handle:
+                same = check(live, handle.read())
+            print(f"{len(live.matches):>8} {len(data) / 1e6:>6.1f} "
+                  f"{statistics.median(timings['refresh']):>10.4f} {statistics.median(timings['competition']):>14.4f} "
+                  f"{statistics.median(timings['summary']):>10.4f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Memory and time of the streaming loader against the whole-document parse.
+
+Scales results_xml.xml 10x and 100x by repeating its teams and tableaux with
+suffixed IDs, then reports wall time and peak RSS growth for each path. Each
+measurement runs in a forked child (so POSIX only) because lxml allocates
+outside the Python heap where tracemalloc cannot see it:
+
+    python benchmarks/bench_loader.py
+"""
+import io
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reference  # noqa: E402
+from xml_loader import iter_competition, load_competition  # noqa: E402
+
+SAMPLE_FILE = os.path.join(ROOT_DIR, "results_xml.xml")
+SCALES = (1, 10, 100)
+ID_ATTRIBUTE = re.compile(rb'\b(ID|REF)="([^"]*)"')
+
+
+def scale_results(data, factor):
+    # Repeat the <Equipes> and <Phases> bodies, suffixing every ID/REF so the
+    # copies are distinct teams, fencers and matches.
+    if factor == 1:
+        return data
+    out = data
+    for tag in (b"Equipes", b"Phases"):
+        start = out.index(b"<%s>" % tag) + len(tag) + 2
+        end = out.index(b"</%s>" % tag)
+        body = out[start:end]
+        copies = [body] + [
+            ID_ATTRIBUTE.sub(lambda m, k=k: b'%s="%s_%d"' % (m.group(1), m.group(2), k), body)
+            for k in range(1, factor)
+        ]
+        out = out[:start] + b"".join(copies) + out[end:]
+    return out
+
+
+def _max_rss():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def _child(func, conn):
+    baseline = _max_rss()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    conn.send((elapsed, _max_rss() - baseline))
+    conn.close()
+
+
+def measure(func):
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.get_context("fork").Process(target=_child, args=(func, child_conn))
+    process.start()
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+def stream_only(data):
+    count = 0
+    for _ in iter_competition(io.BytesIO(data)):
+        count += 1
+    return count
+
+
+def main():
+    with open(SAMPLE_FILE, "rb") as handle:
+        sample = handle.read()
+
+    print(f"{'scale':>6} {'size MB':>8} {'path':<16} {'time s':>8} {'peak MB':>8}")
+    for factor in SCALES:
+        data = scale_results(sample, factor)
+        size_mb = len(data) / 1e6
+        # The raw upload is in memory for every path, so it is not counted.
+        paths = (
+            ("whole document", lambda: reference.parse_xml(data)),
+            ("load_competition", lambda: load_competition(io.BytesIO(data))),
+            ("iter_competition", lambda: stream_only(data)),
+        )
+        for name, func in paths:
+            elapsed, peak = measure(func)
+            print(f"{factor:>6} {size_mb:>8.1f} {name:<16} {elapsed:>8.3f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
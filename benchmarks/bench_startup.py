@@ -0,0 +1,159 @@
+"""Startup time of the Streamlit app, each run in a fresh interpreter.
+
+Every measurement starts a new Python process, so nothing is imported or
+cached beforehand, and runs the app script under Streamlit's AppTest:
+
+* landing: the first run with no file, what a new session waits for
+* upload_cold: the first run with a file uploaded straight away, warm
+  start off
+* upload_warm: the landing run, then the upload once warm_start's
+  background imports have finished (a user picking a file)
+
+Uploads use an empty snapshot directory, so they include parsing. The
+median of --rounds runs is printed and written as JSON, like
+bench_suite. --app points at another checkout's app script, e.g. to
+compare against an earlier commit:
+
+    python benchmarks/bench_startup.py
+    git worktree add /tmp/before HEAD~1
+    python benchmarks/bench_startup.py --app /tmp/before/rudy_report_with_word.py
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "rudy_report_with_word.py")
+DEFAULT_FILE = os.path.join(ROOT_DIR, "results_xml.xml")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SCENARIOS = ("landing", "upload_cold", "upload_warm")
+DEFAULT_ROUNDS = 5
+
+
+# ---------------------------
+# Child Process
+# ---------------------------
+def run_child(scenario, app_path, xml_path):
+    # Prints {step: seconds} for one scenario in this fresh process
+    timings = {}
+    started = time.perf_counter()
+    from unittest import mock
+
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    timings["import streamlit"] = time.perf_counter() - started
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+
+    with open(xml_path, "rb") as handle:
+        data = handle.read()
+
+    class Upload(io.BytesIO):
+        name = os.path.basename(xml_path)
+
+    at = AppTest.from_file(app_path, default_timeout=600)
+    if scenario != "upload_cold":
+        started = time.perf_counter()
+        at.run()
+        timings["landing run"] = time.perf_counter() - started
+    if scenario == "upload_warm" and "warm_start" in sys.modules:
+        started = time.perf_counter()
+        thread = sys.modules["warm_start"].start()
+        if thread is not None:
+            thread.join()
+        timings["warm-up wait"] = time.perf_counter() - started
+    if scenario != "landing":
+        started = time.perf_counter()
+        with mock.patch.object(st.sidebar, "file_uploader", lambda *args, **kwargs: Upload(data)):
+            at.run()
+        timings["upload run"] = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"{scenario}: {at.exception[0].value}")
+    print(json.dumps(timings))
+
+
+def measure(scenario, app_path, xml_path):
+    # Wall time of the whole process and the child's own step timings
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        env = dict(os.environ, REPORT_SNAPSHOT_DIR=snapshot_dir, REPORT_TIMINGS="0")
+        env["REPORT_WARM_START"] = "0" if scenario == "upload_cold" else "1"
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", scenario, "--app", app_path, "--file", xml_path],
+            cwd=snapshot_dir, env=env, capture_output=True, text=True, check=True,
+        )
+        wall = time.perf_counter() - started
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process"] = wall
+    return timings
+
+
+# ---------------------------
+# Benchmark
+# ---------------------------
+def _git_commit(app_path):
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(app_path)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the Streamlit app's first runs in fresh processes.")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="scenario to run, repeatable (default: all)")
+    parser.add_argument("--app", default=APP_PATH, help="app script to run (default: this checkout's)")
+    parser.add_argument("--file", default=DEFAULT_FILE, help="results XML to upload (default: results_xml.xml)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help=f"processes per scenario (default: {DEFAULT_ROUNDS})")
+    parser.add_argument("-o", "--output", help="JSON results path (default: benchmarks/results/startup-<timestamp>.json)")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.app, args.file)
+        return 0
+
+    started = datetime.now(timezone.utc)
+    results = []
+    print(f"{'scenario':<12} {'step':<18} {'median s':>9} {'best s':>9}")
+    for scenario in args.scenario or SCENARIOS:
+        runs = [measure(scenario, args.app, args.file) for _ in range(args.rounds)]
+        for step in runs[0]:
+            values = [run[step] for run in runs]
+            result = {"scenario": scenario, "step": step, "time_median": statistics.median(values),
+                      "time_min": min(values)}
+            results.append(result)
+            print(f"{scenario:<12} {step:<18} {result['time_median']:>9.3f} {result['time_min']:>9.3f}")
+
+    report = {
+        "timestamp": started.isoformat(timespec="seconds"),
+        "commit": _git_commit(args.app),
+        "app": os.path.abspath(args.app),
+        "file": os.path.basename(args.file),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "rounds": args.rounds,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, "startup-" + started.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
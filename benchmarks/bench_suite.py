@@ -0,0 +1,252 @@
+"""Time and memory of every pipeline stage, written as JSON for comparison.
+
+For each synthetic size (see synthetic.PRESETS), a synthetic individual
+event and optionally real files, runs each stage of the XML-to-report path
+on its own:
+
+* load_competition: the streaming loader alone
+* extract_competition: loader plus extraction, what the app runs for a new file
+* load_snapshot: what the app runs for a file whose snapshot is stored
+* build_fencer_dict_and_team_dict, extract_final_rankings,
+  generate_tables_data, summarise_competition: the extraction functions
+  (the first three are team-only and skipped for individual events)
+* export_to_word, export_to_word_template: the whole Word report, with the
+  python-docx and the template backend
+* add_table, add_country_team_table: the table helpers, on the report's
+  largest stage table and its country grid
+
+Each stage runs once in the parent to warm up, then in a forked child (so
+POSIX only) with its inputs prepared beforehand. The child's first run
+gives the peak RSS growth, which includes lxml and NumPy buffers but also
+inherited pages the child touches, so small stages show a floor of a few
+MB; all runs give the best and median wall time; a last run under
+tracemalloc gives the peak Python-heap allocation.
+
+    python benchmarks/bench_suite.py --preset small --preset large
+    python benchmarks/bench_suite.py --preset small --individual 1200
+    python benchmarks/bench_suite.py --file results_xml.xml -o today.json --compare last_week.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document  # noqa: E402
+
+import extraction  # noqa: E402
+import snapshot  # noqa: E402
+import word_export  # noqa: E402
+from synthetic import INDIVIDUAL_PRESET, PRESETS, generate_competition, generate_individual_competition  # noqa: E402
+from xml_loader import load_competition  # noqa: E402
+
+DEFAULT_ROUNDS = 3
+# Stages over xml_loader.load_competition's team records
+TEAM_ONLY_STAGES = {"build_fencer_dict_and_team_dict", "extract_final_rankings", "generate_tables_data"}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+# ---------------------------
+# Measurement
+# ---------------------------
+def _max_rss():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def _child(func, rounds, conn):
+    baseline = _max_rss()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        if len(timings) == 1:
+            rss_peak = _max_rss() - baseline
+    tracemalloc.start()
+    func()
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    conn.send({
+        "time_min": min(timings),
+        "time_median": statistics.median(timings),
+        "rss_peak_bytes": rss_peak,
+        "python_peak_bytes": python_peak,
+    })
+    conn.close()
+
+
+def measure(func, rounds=DEFAULT_ROUNDS):
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.get_context("fork").Process(target=_child, args=(func, rounds, child_conn))
+    process.start()
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+# ---------------------------
+# Pipeline Stages
+# ---------------------------
+def _render(add, *args):
+    doc = Document()
+    add(doc, *args)
+    return doc
+
+
+def pipeline_stages(data, snapshot_dir):
+    """(stage name, zero-argument callable) for one input, in pipeline order."""
+    competition = load_competition(io.BytesIO(data))
+    extracted = extraction.extract_competition(io.BytesIO(data))
+    individual = extracted["kind"] == "individual"
+    if not individual:
+        fencer_dict, team_dict = extraction.build_fencer_dict_and_team_dict(competition)
+    summary = extraction.summarise_competition(extracted)
+    overview_data = extraction.build_overview_data(extracted["info"], summary["num_teams"], summary["num_countries"])
+    stage_tables = list(summary["tables_data"].values())
+    largest_table = max(stage_tables, key=len) if stage_tables else extraction.EMPTY_STAGE_ROWS
+    snapshot.save_snapshot(extracted, "bench", snapshot_dir)
+
+    stages = [
+        ("load_competition", lambda: load_competition(io.BytesIO(data))),
+        ("extract_competition", lambda: extraction.extract_competition(io.BytesIO(data))),
+        ("load_snapshot", lambda: snapshot.load_snapshot("bench", snapshot_dir)),
+        ("build_fencer_dict_and_team_dict", lambda: extraction.build_fencer_dict_and_team_dict(competition)),
+        ("extract_final_rankings", lambda: extraction.extract_final_rankings(competition, team_dict)),
+        ("generate_tables_data", lambda: extraction.generate_tables_data(competition, team_dict, fencer_dict)),
+        ("summarise_competition", lambda: extraction.summarise_competition(extracted)),
+        ("export_to_word", lambda: word_export.export_competition_report(extracted, summary, overview_data)),
+        ("export_to_word_template", lambda: word_export.export_competition_report(
+            extracted, summary, overview_data, backend="template")),
+        ("add_table", lambda: _render(word_export.add_table, largest_table, True)),
+        ("add_country_team_table", lambda: _render(word_export.add_country_team_table, summary["team_count_df"])),
+    ]
+    return [(stage, func) for stage, func in stages if not (individual and stage in TEAM_ONLY_STAGES)]
+
+
+def run_input(name, data, rounds):
+    results = []
+    info = {
+        "input": name,
+        "bytes": len(data),
+        "matches": data.count(b"<Match "),  # Bouts themselves in individual events
+        "bouts": data.count(b"<Assaut "),
+    }
+    with tempfile.TemporaryDirectory(prefix="bench-snapshots-") as snapshot_dir:
+        for stage, func in pipeline_stages(data, snapshot_dir):
+            func()  # Warm up lazy imports and caches so children measure the stage alone
+            result = dict(info, stage=stage, **measure(func, rounds))
+            results.append(result)
+            print(f"{name:<14} {stage:<32} {result['time_min']:>9.4f} {result['time_median']:>9.4f} "
+                  f"{result['rss_peak_bytes'] / 1e6:>8.1f} {result['python_peak_bytes'] / 1e6:>8.1f}", flush=True)
+    return results
+
+
+# ---------------------------
+# Run Metadata and Comparison
+# ---------------------------
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _versions():
+    import docx
+    import lxml.etree
+    import numpy
+    import pandas
+
+    return {
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "lxml": ".".join(map(str, lxml.etree.LXML_VERSION)),
+        "python-docx": getattr(docx, "__version__", "unknown"),
+    }
+
+
+def compare(results, baseline):
+    # Ratios against an earlier run for every (input, stage) both contain
+    previous = {(row["input"], row["stage"]): row for row in baseline["results"]}
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp')}): new / old")
+    print(f"{'input':<14} {'stage':<32} {'time':>8} {'rss':>8} {'python':>8}")
+    for row in results:
+        old = previous.get((row["input"], row["stage"]))
+        if old is None:
+            continue
+        ratios = [
+            row[key] / old[key] if old[key] else float("nan")
+            for key in ("time_min", "rss_peak_bytes", "python_peak_bytes")
+        ]
+        print(f"{row['input']:<14} {row['stage']:<32} " + " ".join(f"{ratio:>7.2f}x" for ratio in ratios))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the XML-to-report pipeline.")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS),
+                        help="synthetic size to run, repeatable (default: all presets)")
+    parser.add_argument("--individual", action="append", type=int, metavar="FENCERS",
+                        help=f"synthetic individual event size, repeatable (default: {INDIVIDUAL_PRESET} unless --preset is given)")
+    parser.add_argument("--file", action="append", default=[], help="also run a real results XML file, repeatable")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help=f"timed runs per stage (default: {DEFAULT_ROUNDS})")
+    parser.add_argument("-o", "--output", help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier JSON results to print ratios against")
+    args = parser.parse_args(argv)
+
+    started = datetime.now(timezone.utc)
+    inputs = []
+    for preset in args.preset or list(PRESETS):
+        num_teams, repeats = PRESETS[preset]
+        inputs.append((preset, generate_competition(num_teams=num_teams, repeats=repeats)))
+    individual_sizes = args.individual or ([] if args.preset else [INDIVIDUAL_PRESET])
+    for num_fencers in individual_sizes:
+        inputs.append((f"individual-{num_fencers}", generate_individual_competition(num_fencers=num_fencers)))
+    for path in args.file:
+        with open(path, "rb") as handle:
+            inputs.append((os.path.basename(path), handle.read()))
+
+    print(f"{'input':<14} {'stage':<32} {'best s':>9} {'median s':>9} {'rss MB':>8} {'py MB':>8}")
+    results = []
+    for name, data in inputs:
+        results.extend(run_input(name, data, args.rounds))
+
+    report = {
+        "timestamp": started.isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": _versions(),
+        "rounds": args.rounds,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, started.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(results, json.load(handle))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
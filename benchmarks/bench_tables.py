@@ -0,0 +1,81 @@
+"""Word table rendering: word_export against the original python-docx helpers.
+
+For 50, 200 and 1000-row tables, times a striped stage table (add_table) and
+the "Number of Teams per Country" grid with that many countries, and reports
+the size of the saved .docx for each. The original country grid restyles the
+whole table once per country, so it is only run up to REFERENCE_GRID_LIMIT
+rows (200 already takes over ten seconds).
+
+    python benchmarks/bench_tables.py
+"""
+import os
+import sys
+import time
+from io import BytesIO
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+from docx import Document  # noqa: E402
+
+import reference  # noqa: E402
+import word_export  # noqa: E402
+
+ROW_COUNTS = (50, 200, 1000)
+REFERENCE_GRID_LIMIT = 200
+
+
+def stage_frame(num_rows):
+    return pd.DataFrame([
+        {
+            "Team_1": f"TEAM {i % 7}",
+            "Fencer_1": f"Fencer D{i}",
+            "Touches_1": f"{i % 6} ({i % 3})",
+            "Score_1": i,
+            "Score_2": i + 1,
+            "Touches_2": f"{i % 5} ({-(i % 3)})",
+            "Fencer_2": f"Fencer G{i}",
+            "Team_2": f"TEAM {i % 11}",
+        }
+        for i in range(num_rows)
+    ])
+
+
+def country_frame(num_rows):
+    return pd.DataFrame(
+        [(f"C{i:03d}", i % 4 + 1) for i in range(num_rows)],
+        columns=["Country", "Number of Teams"],
+    )
+
+
+def render(add, df, **kwargs):
+    doc = Document()
+    started = time.perf_counter()
+    add(doc, df, **kwargs)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return time.perf_counter() - started, len(buffer.getvalue())
+
+
+def main():
+    cases = (
+        ("stage table", stage_frame, reference.add_table, word_export.add_table, {"striped": True}),
+        ("country grid", country_frame, reference.add_country_team_table, word_export.add_country_team_table, {}),
+    )
+    print(f"{'table':<13} {'rows':>5} {'reference s':>12} {'new s':>8} {'speedup':>8} {'ref KB':>8} {'new KB':>8}")
+    for name, make_frame, ref_add, new_add, kwargs in cases:
+        for num_rows in ROW_COUNTS:
+            df = make_frame(num_rows)
+            new_time, new_size = render(new_add, df, **kwargs)
+            if ref_add is reference.add_country_team_table and num_rows > REFERENCE_GRID_LIMIT:
+                print(f"{name:<13} {num_rows:>5} {'skipped':>12} {new_time:>8.3f} {'':>8} {'':>8} {new_size / 1024:>8.1f}")
+                continue
+            ref_time, ref_size = render(ref_add, df, **kwargs)
+            print(f"{name:<13} {num_rows:>5} {ref_time:>12.3f} {new_time:>8.3f} "
+                  f"{ref_time / new_time:>7.1f}x {ref_size / 1024:>8.1f} {new_size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Rerun time and element payload of the app's report page.
+
+Uploads a synthetic competition to the app under Streamlit's AppTest,
+runs it once to parse and summarise, then times --rounds further reruns
+(what every widget change costs, with everything cached) and sums the
+serialised size of the elements the page sends, per tab. --app points at
+another checkout's app script, as in bench_startup.
+
+    python benchmarks/bench_ui.py
+    python benchmarks/bench_ui.py --preset medium --app /tmp/before/rudy_report_with_word.py
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "rudy_report_with_word.py")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import PRESETS, generate_competition  # noqa: E402
+
+ROUNDS = 5
+
+
+def payload_bytes(node):
+    # Serialised size of every element under an AppTest node
+    proto = getattr(node, "proto", None)
+    if proto is not None and not hasattr(node, "children"):
+        return proto.ByteSize()
+    return sum(payload_bytes(child) for child in getattr(node, "children", {}).values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time reruns of the app's report page.")
+    parser.add_argument("--preset", default="large", choices=sorted(PRESETS), help="synthetic size (default: large)")
+    parser.add_argument("--app", default=APP_PATH, help="app script to run (default: this checkout's)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"timed reruns (default: {ROUNDS})")
+    args = parser.parse_args(argv)
+
+    num_teams, repeats = PRESETS[args.preset]
+    data = generate_competition(num_teams=num_teams, repeats=repeats)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["REPORT_SNAPSHOT_DIR"] = tmp_dir
+        os.environ["SEASON_DB"] = os.path.join(tmp_dir, "season.sqlite")
+        os.environ["REPORT_WARM_START"] = "0"
+        sys.path.insert(0, os.path.dirname(os.path.abspath(args.app)))
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+
+        class Upload(io.BytesIO):
+            name = f"synthetic-{args.preset}.xml"
+
+        at = AppTest.from_file(args.app, default_timeout=600)
+        with mock.patch.object(st.sidebar, "file_uploader", lambda *a, **k: Upload(data)):
+            started = time.perf_counter()
+            at.run()
+            first_run = time.perf_counter() - started
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+            timings = []
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                at.run()
+                timings.append(time.perf_counter() - started)
+
+        print(f"{args.preset}: {len(data) / 1e6:.1f} MB, first run {first_run:.2f}s, "
+              f"rerun median {statistics.median(timings):.3f}s (best {min(timings):.3f}s)")
+        print(f"{'tab':<20} {'payload KB':>11}")
+        for tab in at.tabs:
+            print(f"{tab.label:<20} {payload_bytes(tab) / 1024:>11.1f}")
+        print(f"{'whole page':<20} {payload_bytes(at._tree) / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
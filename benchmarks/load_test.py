@@ -0,0 +1,128 @@
+"""Latency of the render service under concurrent clients.
+
+Each client thread posts results files to /render back to back and the
+per-request latencies are summarised as p50/p99 per source (cache, shared,
+render, as reported by the service) and overall.
+
+    python benchmarks/load_test.py --clients 8 --requests 5
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --file results_xml.xml --nation QAT --nation ITA
+
+Without --url a service is started in this process on a free port, with
+--workers render processes and snapshots in a temporary directory, so the
+first requests measure cold renders.
+"""
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from render_service import make_server  # noqa: E402
+from synthetic import PRESETS, generate_competition  # noqa: E402
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a non-empty list
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def post(url, xml_bytes, nation):
+    query = urllib.parse.urlencode({"nation": nation})
+    request = urllib.request.Request(f"{url}/render?{query}", data=xml_bytes)
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=600) as response:
+        response.read()
+        source = response.headers.get("X-Report-Source", "unknown")
+    return time.perf_counter() - started, source
+
+
+def run_clients(url, jobs, clients, requests_per_client):
+    """Latencies grouped by source; jobs are (xml bytes, nation) cycled per client."""
+    latencies = defaultdict(list)
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(offset):
+        job_cycle = itertools.islice(itertools.cycle(jobs), offset, None)
+        barrier.wait()  # All clients start together, so identical requests overlap
+        for _ in range(requests_per_client):
+            xml_bytes, nation = next(job_cycle)
+            try:
+                elapsed, source = post(url, xml_bytes, nation)
+            except OSError as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies[source].append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(index % len(jobs),)) for index in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the report render service.")
+    parser.add_argument("--url", help="running service to test (default: start one in-process)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render processes of the in-process service")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients (default: 8)")
+    parser.add_argument("--requests", type=int, default=5, help="requests per client (default: 5)")
+    parser.add_argument("--file", action="append", default=[], help="results XML to send, repeatable")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium",
+                        help="synthetic file to send when no --file is given (default: medium)")
+    parser.add_argument("--nation", action="append", help="nations to request, repeatable (default: QAT)")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.file:
+        with open(path, "rb") as handle:
+            files.append(handle.read())
+    if not files:
+        num_teams, repeats = PRESETS[args.preset]
+        files.append(generate_competition(num_teams=num_teams, repeats=repeats))
+    jobs = [(xml_bytes, nation) for xml_bytes in files for nation in args.nation or ["QAT"]]
+
+    server = renderer = None
+    url = args.url
+    if url is None:
+        server, renderer = make_server(port=0, workers=args.workers, snapshot_dir=tempfile.mkdtemp(prefix="load-test-"))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        latencies, errors, elapsed = run_clients(url.rstrip("/"), jobs, args.clients, args.requests)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            renderer.shutdown()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    print(f"{args.clients} clients x {args.requests} requests, {len(jobs)} distinct reports, {elapsed:.2f}s wall, "
+          f"{len(all_latencies) / elapsed:.1f} req/s, {len(errors)} errors")
+    print(f"{'source':<10} {'count':>6} {'p50 s':>9} {'p99 s':>9} {'mean s':>9}")
+    for source, values in sorted(latencies.items()) + [("all", all_latencies)]:
+        if values:
+            print(f"{source:<10} {len(values):>6} {percentile(values, 0.5):>9.4f} "
+                  f"{percentile(values, 0.99):>9.4f} {statistics.mean(values):>9.4f}")
+    for error in errors[:5]:
+        print(f"error: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
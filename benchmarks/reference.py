@@ -0,0 +1,218 @@
+# Reference implementations of the original pipeline: the single
+# ET.fromstring parse, the ElementTree-walking extraction functions the app
+# used before the streaming loader, and the python-docx table helpers from
+# before word_export. Benchmarks time the current code against these and use
+# them to check that outputs have not changed.
+import re
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+import pandas as pd
+from docx.shared import Pt, RGBColor
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+
+def parse_xml(data):
+    content_str = data.decode("utf-8-sig").strip()
+    content_str = re.sub(r"[^\x20-\x7E\t\n\r]", "", content_str)
+    return ET.fromstring(content_str)
+
+
+def build_fencer_dict_and_team_dict(root):
+    fencer_dict = {}
+    team_dict = {}
+    for equipe in root.findall(".//Equipe"):
+        team_id = equipe.get('ID')
+        nation = equipe.get('Nation')
+        team_name = equipe.get('IdOrigine') if team_id and team_id.isdigit() else team_id
+        if not team_id or not nation or not team_name:
+            continue
+
+        team_dict[team_id] = {"Team Name": team_name, "Nation": nation}
+
+        for tireur in equipe.findall(".//Tireur"):
+            fencer_id = tireur.get('ID')
+            fencer_name = f"{tireur.get('Prenom')} {tireur.get('Nom')}"
+            date_of_birth = tireur.get("DateNaissance", "Unknown")
+            lateralite = tireur.get("Lateralite", "Unknown")
+
+            fencer_dict[fencer_id] = {
+                "Name": fencer_name,
+                "Date of Birth": date_of_birth,
+                "Lateralite": lateralite,
+                "EquipeID": team_id,
+                "Nation": nation,
+                "Team Name": team_name
+            }
+    return fencer_dict, team_dict
+
+def extract_final_rankings(root, team_dict):
+    rankings = []
+    for phase in root.findall(".//PhaseDeTableaux"):
+        for equipe in phase.findall(".//Equipe"):
+            team_id = equipe.get('REF')
+            final_rank = equipe.get('RangFinal')
+            if team_id and final_rank:
+                team_name = team_dict.get(team_id, {}).get("Team Name", team_id)
+                nation = team_dict.get(team_id, {}).get("Nation", "Unknown")
+                rankings.append({
+                    "Team Name": team_name,
+                    "Nation": nation,
+                    "Final Rank": int(final_rank)
+                })
+    return pd.DataFrame(rankings).sort_values(by="Final Rank").reset_index(drop=True)
+
+# nation was hardcoded to "QAT" in the original; a parameter here so the
+# benchmarks can run the same loop once per nation
+def generate_tables_data(root, team_dict, fencer_dict, nation="QAT"):
+    results_by_stage = defaultdict(list)
+    accumulated_touches = defaultdict(lambda: {"scored": 0, "against": 0, "matches": []})
+
+    for suite in root.findall(".//SuiteDeTableaux"):
+        for tableau in suite.findall(".//Tableau"):
+            stage_title = tableau.get('Titre', 'Unknown Stage')
+            for match in tableau.findall(".//Match"):
+                team_d_ref = match.find(".//Equipe[@Cote='D']")
+                team_g_ref = match.find(".//Equipe[@Cote='G']")
+                team_d = team_dict.get(team_d_ref.get('REF')) if team_d_ref is not None else None
+                team_g = team_dict.get(team_g_ref.get('REF')) if team_g_ref is not None else None
+                team_d_name = team_d["Team Name"] if team_d else "Unknown Team"
+                team_g_name = team_g["Team Name"] if team_g else "Unknown Team"
+
+                # Only process matches involving the nation
+                if (team_d and team_d["Nation"] == nation) or (team_g and team_g["Nation"] == nation):
+                    prev_score_1, prev_score_2 = 0, 0
+                    for assaut in match.findall(".//Assaut"):
+                        fencer_d_ref = assaut.find(".//Tireur[@Cote='D']").get('REF')
+                        fencer_g_ref = assaut.find(".//Tireur[@Cote='G']").get('REF')
+                        score_d = int(assaut.find(".//Tireur[@Cote='D']").get('Score', 0))
+                        score_g = int(assaut.find(".//Tireur[@Cote='G']").get('Score', 0))
+                        touches_d = score_d - prev_score_1
+                        touches_g = score_g - prev_score_2
+                        diff_in_touches = touches_d - touches_g
+                        prev_score_1, prev_score_2 = score_d, score_g
+
+                        fencer_d = fencer_dict.get(fencer_d_ref, {"Name": "Unknown", "Nation": "Unknown"})
+                        fencer_g = fencer_dict.get(fencer_g_ref, {"Name": "Unknown", "Nation": "Unknown"})
+
+                        if fencer_d["Nation"] == nation:
+                            accumulated_touches[fencer_d["Name"]]["scored"] += touches_d
+                            accumulated_touches[fencer_d["Name"]]["against"] += touches_g
+                            outcome = "Victory" if touches_d > touches_g else "Defeat" if touches_d < touches_g else "Draw"
+                            accumulated_touches[fencer_d["Name"]]["matches"].append({
+                                "Opponent Team": team_g_name,
+                                "Outcome": outcome
+                            })
+
+                        if fencer_g["Nation"] == nation:
+                            accumulated_touches[fencer_g["Name"]]["scored"] += touches_g
+                            accumulated_touches[fencer_g["Name"]]["against"] += touches_d
+                            outcome = "Victory" if touches_g > touches_d else "Defeat" if touches_g < touches_d else "Draw"
+                            accumulated_touches[fencer_g["Name"]]["matches"].append({
+                                "Opponent Team": team_d_name,
+                                "Outcome": outcome
+                            })
+
+                        row_data = {
+                            "Team_1": team_d_name,
+                            "Fencer_1": fencer_d["Name"],
+                            "Touches_1": f"{touches_d} ({diff_in_touches})",
+                            "Score_1": score_d,
+                            "Score_2": score_g,
+                            "Touches_2": f"{touches_g} ({-diff_in_touches})",
+                            "Fencer_2": fencer_g["Name"],
+                            "Team_2": team_g_name
+                        }
+                        results_by_stage[stage_title].append(row_data)
+    return results_by_stage, accumulated_touches
+
+
+# Review tab / section: one groupby per fencer
+def outcome_summary_table(matches):
+    match_outcomes_df = pd.DataFrame(matches)
+    if match_outcomes_df.empty:
+        return match_outcomes_df
+    return (
+        match_outcomes_df
+        .groupby(['Opponent Team', 'Outcome'])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=["Victory", "Defeat", "Draw"], fill_value=0)
+        .reset_index()
+    )
+
+
+# Add a table with header and striped rows styling
+def add_table(doc, df, striped=False):
+    HEADER_MAROON = '8A1538'
+    LIGHT_MAROON = 'AD5B74'
+    WHITE = 'FFFFFF'
+
+    table = doc.add_table(rows=1, cols=len(df.columns))
+    table.style = 'Table Grid'
+
+    # Header row styling
+    hdr_cells = table.rows[0].cells
+    for i, col in enumerate(df.columns):
+        hdr_cells[i].text = str(col)
+        hdr_cells[i].paragraphs[0].runs[0].bold = True
+        hdr_cells[i].paragraphs[0].alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        tcPr = hdr_cells[i]._element.get_or_add_tcPr()
+        shading_elm = OxmlElement('w:shd')
+        shading_elm.set(qn('w:fill'), HEADER_MAROON)
+        tcPr.append(shading_elm)
+        for run in hdr_cells[i].paragraphs[0].runs:
+            run.font.color.rgb = RGBColor(255, 255, 255)
+
+    # Data rows
+    for _, row in df.iterrows():
+        row_cells = table.add_row().cells
+        for i, value in enumerate(row):
+            row_cells[i].text = str(value)
+            row_cells[i].paragraphs[0].alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+    # Apply striped (banded row) styling if requested
+    if striped:
+        for i, row in enumerate(table.rows):
+            if i == 0:
+                continue
+            fill_color = LIGHT_MAROON if (i % 2 == 0) else WHITE
+            for cell in row.cells:
+                cell_props = cell._element.get_or_add_tcPr()
+                shading = OxmlElement('w:shd')
+                shading.set(qn('w:fill'), fill_color)
+                cell_props.append(shading)
+                for paragraph in cell.paragraphs:
+                    for run in paragraph.runs:
+                        run.font.color.rgb = RGBColor(0, 0, 0)
+    return table
+
+# Format cells in an existing table (if needed)
+def format_table_cells(table, font_size=8, background_color="D9E1F2"):
+    for row in table.rows:
+        for cell in row.cells:
+            for paragraph in cell.paragraphs:
+                for run in paragraph.runs:
+                    run.font.size = Pt(font_size)
+            cell_properties = cell._element.find(qn("w:tcPr"))
+            if cell_properties is None:
+                cell_properties = OxmlElement("w:tcPr")
+                cell._element.append(cell_properties)
+            shading_elm = OxmlElement("w:shd")
+            shading_elm.set(qn("w:val"), "clear")
+            shading_elm.set(qn("w:color"), "auto")
+            shading_elm.set(qn("w:fill"), background_color)
+            cell_properties.append(shading_elm)
+
+# Create a grid table for "Number of Teams per Country"
+def add_country_team_table(doc, df, columns_per_row=4):
+    num_rows = (len(df) + columns_per_row - 1) // columns_per_row
+    table = doc.add_table(rows=num_rows, cols=columns_per_row * 2, style="Table Grid")
+    for idx, (country, count) in enumerate(df.itertuples(index=False)):
+        row_idx = idx // columns_per_row
+        col_idx = (idx % columns_per_row) * 2
+        table.cell(row_idx, col_idx).text = country
+        table.cell(row_idx, col_idx + 1).text = str(count)
+        format_table_cells(table, font_size=8)
+    doc.add_paragraph()  # Space after the table
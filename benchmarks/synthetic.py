@@ -0,0 +1,246 @@
+"""Synthetic CompetitionParEquipes and CompetitionIndividuelle files for benchmarks.
+
+Teams are spread over a list of nations (QAT always included) and play a
+knockout tableau; every match is a relay of TailleEquipe x TailleEquipe legs
+with cumulative scores, as the Ophardt export writes them. Files have the
+same layout as results_xml.xml: Equipes with Tireurs, Arbitres, then a
+PhaseDeTableaux with final ranks and SuiteDeTableaux/Tableau/Match/Assaut.
+
+    python benchmarks/synthetic.py --preset large -o large.xml
+    python benchmarks/synthetic.py --teams 128 --repeats 8 --team-size 4 -o event.xml
+    python benchmarks/synthetic.py --individual 600 -o individual.xml
+
+Individual events have a Tireurs list, one round of poules of up to seven
+fencers with every pairing fenced, then a direct-elimination tableau of
+the whole field, as in Ophardt's individual export.
+"""
+import argparse
+import random
+import sys
+
+NATIONS = (
+    "QAT", "AUT", "BUL", "CZE", "FRA", "GBR", "GER", "HUN", "ITA", "NED",
+    "POL", "ROU", "SRB", "SUI", "TUR", "UKR", "ESP", "USA", "JPN", "KOR",
+    "CHN", "EGY", "ISR", "CAN", "BRA", "ARG", "DEN", "SWE", "NOR", "FIN",
+)
+
+
+# Named sizes shared by the benchmarks: (teams, repeats). "large" is about
+# 110k bouts; the sample file has 378.
+PRESETS = {
+    "small": (16, 1),
+    "medium": (64, 4),
+    "large": (512, 24),
+}
+
+# Fencers in the individual event used by the benchmarks: 86 poules with
+# about 1,800 poule bouts, plus 599 DE bouts
+INDIVIDUAL_PRESET = 600
+
+
+def _team_ids(num_teams, nations):
+    ids = []
+    for index in range(num_teams):
+        nation = nations[index % len(nations)]
+        ids.append((f"{nation} {index // len(nations) + 1}", nation))
+    return ids
+
+
+def generate_competition(num_teams=64, team_size=3, repeats=1, seed=0, nations=NATIONS, num_referees=8):
+    """Return the XML of a synthetic team event as bytes.
+
+    ``repeats`` replays the whole knockout as additional SuiteDeTableaux,
+    which multiplies the number of matches and bouts without adding teams.
+    """
+    rng = random.Random(seed)
+    teams = _team_ids(num_teams, nations)
+    fencers = {
+        team_id: [f"{index + 1}{member:02d}" for member in range(team_size + 1)]
+        for index, (team_id, _) in enumerate(teams)
+    }
+    referees = [(f"9{index:05d}", nations[index % len(nations)]) for index in range(num_referees)]
+
+    out = [
+        '<?xml version="1.0" encoding="utf-8"?>\n',
+        "<!DOCTYPE CompetitionParEquipes>\n",
+        f'<CompetitionParEquipes ID="{seed + 1}" Championnat="SYN" Annee="2024/2025" '
+        f'Arme="E" Sexe="M" Categorie="C" Date="27.10.2024" TailleEquipe="{team_size}" '
+        f'TitreCourtTournoi="Synthetic {num_teams}x{repeats}" Lieu="Benchmark">\n',
+        "<Equipes>\n",
+    ]
+    for rank, (team_id, nation) in enumerate(teams, start=1):
+        out.append(f'<Equipe ID="{team_id}" Nation="{nation}" Classement="{rank}">\n')
+        for fencer_id in fencers[team_id]:
+            out.append(
+                f'  <Tireur ID="{fencer_id}" Nom="NOM{fencer_id}" Prenom="Prenom{fencer_id}" '
+                f'DateNaissance="01.01.2008" Sexe="M" Lateralite="{rng.choice("DG")}" '
+                f'Licence="{fencer_id}" Nation="{nation}" />\n'
+            )
+        out.append("</Equipe>\n")
+    out.append("</Equipes>\n<Arbitres>\n")
+    for referee_id, nation in referees:
+        out.append(
+            f'<Arbitre ID="{referee_id}" Nom="ARB{referee_id}" Prenom="Ref{referee_id}" '
+            f'Sexe="M" Licence="{referee_id}" Nation="{nation}" Categorie="I" />\n'
+        )
+    out.append("</Arbitres>\n<Phases>\n")
+    out.append('<PhaseDeTableaux PhaseID="PhaseTableaux1" ID="1">\n')
+    order = list(range(num_teams))
+    rng.shuffle(order)
+    for rank, index in enumerate(order, start=1):
+        out.append(f'<Equipe REF="{teams[index][0]}" RangInitial="{index + 1}" RangFinal="{rank}" Statut="N" />\n')
+
+    legs = team_size * team_size
+    match_id = 0
+    for repeat in range(repeats):
+        out.append(f'<SuiteDeTableaux ID="Suite_{repeat}" Titre="Suite {repeat}">\n')
+        alive = [team_id for team_id, _ in teams]
+        size = 1
+        while size < len(alive):
+            size *= 2
+        while len(alive) > 1:
+            out.append(f'<Tableau ID="T{repeat}_{size}" Titre="Tableau de {size} ({repeat})" Taille="{size}">\n')
+            winners = []
+            for pair in range(0, len(alive) - 1, 2):
+                team_d, team_g = alive[pair], alive[pair + 1]
+                match_id += 1
+                out.append(f'<Match ID="{match_id}" Date="27.10.2024" Piste="{"RED" if match_id % 2 else "BLUE"}">\n')
+                if referees:
+                    out.append(f'<Arbitre REF="{rng.choice(referees)[0]}" Role="P"/>\n')
+                score_d = score_g = 0
+                bouts = []
+                for leg in range(legs):
+                    score_d += rng.randint(0, 5)
+                    score_g += rng.randint(0, 5)
+                    bouts.append(
+                        f'<Assaut ID="{leg + 1}">\n'
+                        f'  <Tireur REF="{fencers[team_d][leg % team_size]}" Score="{score_d}" Cote="D" />\n'
+                        f'  <Tireur REF="{fencers[team_g][(leg // team_size) % team_size]}" Score="{score_g}" Cote="G" />\n'
+                        "</Assaut>\n"
+                    )
+                winner_d = score_d >= score_g
+                out.append(f'<Equipe REF="{team_d}" Score="{score_d}" Statut="{"V" if winner_d else "D"}" Cote="D" />\n')
+                out.append(f'<Equipe REF="{team_g}" Score="{score_g}" Statut="{"D" if winner_d else "V"}" Cote="G" />\n')
+                out.extend(bouts)
+                out.append("</Match>\n")
+                winners.append(team_d if winner_d else team_g)
+            if len(alive) % 2:
+                winners.append(alive[-1])
+            alive = winners
+            size //= 2
+            out.append("</Tableau>\n")
+        out.append("</SuiteDeTableaux>\n")
+    out.append("</PhaseDeTableaux>\n</Phases>\n</CompetitionParEquipes>\n")
+    return "".join(out).encode("utf-8")
+
+
+def _poules(entries, poule_size):
+    # Snake seeding into the fewest poules of at most poule_size fencers
+    num_poules = -(-len(entries) // poule_size)
+    poules = [[] for _ in range(num_poules)]
+    for index, entry in enumerate(entries):
+        row, column = divmod(index, num_poules)
+        poules[column if row % 2 == 0 else num_poules - 1 - column].append(entry)
+    return poules
+
+
+def generate_individual_competition(num_fencers=300, poule_size=7, seed=0, nations=NATIONS):
+    """Return the XML of a synthetic individual event as bytes."""
+    rng = random.Random(seed)
+    entries = [(f"{index + 1:05d}", nations[index % len(nations)]) for index in range(num_fencers)]
+    out = [
+        '<?xml version="1.0" encoding="utf-8"?>\n',
+        "<!DOCTYPE CompetitionIndividuelle>\n",
+        f'<CompetitionIndividuelle ID="{seed + 1}" Championnat="SYN" Annee="2024/2025" '
+        f'Arme="E" Sexe="M" Categorie="C" Date="26.10.2024" '
+        f'TitreCourtTournoi="Synthetic individual {num_fencers}" Lieu="Benchmark">\n',
+        "<Tireurs>\n",
+    ]
+    final_rank = list(range(1, num_fencers + 1))
+    rng.shuffle(final_rank)
+    for (fencer_id, nation), rank in zip(entries, final_rank):
+        out.append(
+            f'<Tireur ID="{fencer_id}" Nom="NOM{fencer_id}" Prenom="Prenom{fencer_id}" '
+            f'DateNaissance="01.01.2008" Sexe="M" Lateralite="{rng.choice("DG")}" '
+            f'Nation="{nation}" Club="Club {nation}" Classement="{rank}" />\n'
+        )
+    out.append("</Tireurs>\n<Phases>\n")
+
+    out.append('<TourDePoules PhaseID="TourPoules1" ID="1">\n')
+    match_id = 0
+    for poule_id, poule in enumerate(_poules(entries, poule_size), start=1):
+        out.append(f'<Poule ID="{poule_id}" Piste="{poule_id}">\n')
+        for number, (fencer_id, _) in enumerate(poule, start=1):
+            out.append(f'<Tireur REF="{fencer_id}" NoDansLaPoule="{number}" />\n')
+        for first in range(len(poule)):
+            for second in range(first + 1, len(poule)):
+                match_id += 1
+                winner_score = 5 if rng.random() < 0.8 else rng.randint(1, 4)
+                loser_score = rng.randint(0, winner_score - 1) if rng.random() < 0.95 else winner_score
+                first_wins = rng.random() < 0.5
+                scores = (winner_score, loser_score) if first_wins else (loser_score, winner_score)
+                out.append(f'<Match ID="{match_id}">\n')
+                for (fencer_id, _), score, won in zip((poule[first], poule[second]), scores, (first_wins, not first_wins)):
+                    out.append(f'  <Tireur REF="{fencer_id}" Score="{score}" Statut="{"V" if won else "D"}" />\n')
+                out.append("</Match>\n")
+        out.append("</Poule>\n")
+    out.append("</TourDePoules>\n")
+
+    out.append('<PhaseDeTableaux PhaseID="PhaseTableaux1" ID="2">\n<SuiteDeTableaux ID="A" Titre="Main">\n')
+    alive = [fencer_id for fencer_id, _ in entries]
+    rng.shuffle(alive)
+    size = 1
+    while size < len(alive):
+        size *= 2
+    while len(alive) > 1:
+        out.append(f'<Tableau ID="A{size}" Titre="Tableau de {size}" Taille="{size}">\n')
+        winners = []
+        for pair in range(0, len(alive) - 1, 2):
+            match_id += 1
+            loser_score = rng.randint(3, 14)
+            first_wins = rng.random() < 0.5
+            scores = (15, loser_score) if first_wins else (loser_score, 15)
+            out.append(f'<Match ID="{match_id}">\n')
+            for fencer_id, score, won in zip(alive[pair:pair + 2], scores, (first_wins, not first_wins)):
+                out.append(f'  <Tireur REF="{fencer_id}" Score="{score}" Statut="{"V" if won else "D"}" />\n')
+            out.append("</Match>\n")
+            winners.append(alive[pair] if first_wins else alive[pair + 1])
+        if len(alive) % 2:
+            winners.append(alive[-1])
+        alive = winners
+        size //= 2
+        out.append("</Tableau>\n")
+    out.append("</SuiteDeTableaux>\n</PhaseDeTableaux>\n</Phases>\n</CompetitionIndividuelle>\n")
+    return "".join(out).encode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic CompetitionParEquipes XML file.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="named size; overrides --teams and --repeats")
+    parser.add_argument("--teams", type=int, default=64, help="number of teams (default: 64)")
+    parser.add_argument("--repeats", type=int, default=1, help="number of SuiteDeTableaux (default: 1)")
+    parser.add_argument("--team-size", type=int, default=3, help="fencers per relay side (default: 3)")
+    parser.add_argument("--individual", type=int, metavar="FENCERS",
+                        help="write an individual event with this many fencers instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True, help="path of the XML file to write")
+    args = parser.parse_args(argv)
+
+    if args.individual:
+        data = generate_individual_competition(num_fencers=args.individual, seed=args.seed)
+        with open(args.output, "wb") as handle:
+            handle.write(data)
+        print(f"{args.output}: {args.individual} fencers, {data.count(b'<Match ')} bouts, {len(data) / 1e6:.1f} MB")
+        return 0
+
+    num_teams, repeats = PRESETS[args.preset] if args.preset else (args.teams, args.repeats)
+    data = generate_competition(num_teams=num_teams, team_size=args.team_size, repeats=repeats, seed=args.seed)
+    with open(args.output, "wb") as handle:
+        handle.write(data)
+    print(f"{args.output}: {num_teams} teams, {data.count(b'<Match ')} matches, "
+          f"{data.count(b'<Assaut ')} bouts, {len(data) / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Word reports written as WordprocessingML straight into a template package.
+
+The python-docx backend in word_export builds every paragraph, table row
+and cell as lxml elements before serialising the document. TemplateReport
+writes the same markup as text instead: each row becomes one string,
+streamed into a deflated word/document.xml as the report is built, and
+every other part (styles, theme, settings, properties) is copied unchanged
+from a prebuilt .docx template. The template's page setup (its body's
+sectPr) is kept and anything else in its body is dropped; its styles must
+define Heading1, Heading2 and TableGrid.
+
+templates/report_template.docx is python-docx's default document with the
+report's 0.5" margins, so both backends produce the same document.xml.
+Regenerate it with
+
+    python docx_template.py
+"""
+import functools
+import os
+import re
+import sys
+import zipfile
+from io import BytesIO
+
+from docx.shared import Emu, Twips
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "report_template.docx")
+DOCUMENT_PART = "word/document.xml"
+# Page margins of the report, in inches
+MARGIN_INCHES = 0.5
+# Fragments are passed to the compressor in batches of about this many characters
+FLUSH_CHARS = 256 * 1024
+
+SECT_PR = re.compile(r"<w:sectPr[ >].*?</w:sectPr>|<w:sectPr[^>]*/>", re.S)
+PAGE_WIDTH = re.compile(r'<w:pgSz\b[^>]*\bw:w="(\d+)"')
+LEFT_MARGIN = re.compile(r'<w:pgMar\b[^>]*\bw:left="(\d+)"')
+RIGHT_MARGIN = re.compile(r'<w:pgMar\b[^>]*\bw:right="(\d+)"')
+XML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+RUN_BREAKS = re.compile(r"([\t\r\n])")
+
+
+def write_template(path=TEMPLATE_PATH):
+    # python-docx's default template with the report's margins
+    from docx import Document
+    from docx.shared import Inches
+
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(MARGIN_INCHES)
+        section.bottom_margin = Inches(MARGIN_INCHES)
+        section.left_margin = Inches(MARGIN_INCHES)
+        section.right_margin = Inches(MARGIN_INCHES)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.save(path)
+    return path
+
+
+def _twips(pattern, xml, default):
+    found = pattern.search(xml)
+    return int(found.group(1)) if found else default
+
+
+@functools.lru_cache(maxsize=4)
+def load_template(path=TEMPLATE_PATH):
+    """(parts, document head, document tail, text width in twips) of a template.
+
+    parts is [(ZipInfo, bytes)] in package order; the document part's
+    bytes are None, as its body is written per report.
+    """
+    with zipfile.ZipFile(path) as package:
+        parts = [(info, None if info.filename == DOCUMENT_PART else package.read(info)) for info in package.infolist()]
+        document = package.read(DOCUMENT_PART).decode("utf-8")
+    body_start = document.index("<w:body>") + len("<w:body>")
+    sect_pr = SECT_PR.search(document, body_start)
+    sect_xml = sect_pr.group() if sect_pr else ""
+    head = document[:body_start]
+    tail = sect_xml + document[document.index("</w:body>"):]
+    # Twips between the margins, defaulting as python-docx does
+    text_width = (
+        _twips(PAGE_WIDTH, sect_xml, 12240) - _twips(LEFT_MARGIN, sect_xml, 1440) - _twips(RIGHT_MARGIN, sect_xml, 1440)
+    )
+    return parts, head, tail, text_width
+
+
+# ---------------------------
+# Markup Fragments
+# ---------------------------
+def run_content(text):
+    # w:t/w:tab/w:br content of a run, as python-docx writes run.text
+    if not text:
+        return ""
+    if "\t" in text or "\n" in text or "\r" in text:
+        pieces = []
+        for piece in RUN_BREAKS.split(text):
+            if piece == "\t":
+                pieces.append("<w:tab/>")
+            elif piece in ("\r", "\n"):
+                pieces.append("<w:br/>")
+            elif piece:
+                pieces.append(run_content(piece))
+        return "".join(pieces)
+    if len(text.strip()) < len(text):
+        return f'<w:t xml:space="preserve">{text.translate(XML_ESCAPES)}</w:t>'
+    return f"<w:t>{text.translate(XML_ESCAPES)}</w:t>"
+
+
+def run(text, run_props=""):
+    return f"<w:r>{run_props}{run_content(text)}</w:r>"
+
+
+def shading(fill, clear=False):
+    if clear:
+        return f'<w:shd w:val="clear" w:color="auto" w:fill="{fill}"/>'
+    return f'<w:shd w:fill="{fill}"/>'
+
+
+def table_start(cols, text_width, style="TableGrid"):
+    # Columns share the text width evenly, rounded as python-docx does
+    col_width = Emu(Twips(text_width) // cols).twips if cols else 0
+    grid = f'<w:gridCol w:w="{col_width}"/>' * cols
+    return (
+        f'<w:tbl><w:tblPr><w:tblStyle w:val="{style}"/><w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" '
+        f'w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>'
+    ), col_width
+
+
+def cell_open(col_width, cell_shading="", paragraph_props=""):
+    # Everything of a cell up to its run; close with CELL_CLOSE
+    return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/>{cell_shading}</w:tcPr><w:p>{paragraph_props}'
+
+
+CELL_CLOSE = "</w:p></w:tc>"
+CENTERED = '<w:pPr><w:jc w:val="center"/></w:pPr>'
+PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+EMPTY_PARAGRAPH = "<w:p/>"
+
+
+# ---------------------------
+# Streaming Report Document
+# ---------------------------
+class TemplateReport:
+    """Report body streamed into a copy of a .docx template."""
+
+    def __init__(self, template=TEMPLATE_PATH):
+        self._parts, head, self._tail, self.text_width = load_template(template)
+        self._buffer = BytesIO()
+        self._package = zipfile.ZipFile(self._buffer, "w", zipfile.ZIP_DEFLATED)
+        self._remaining = iter(self._parts)
+        # Parts before the document part, then the document part left open
+        for info, data in self._remaining:
+            if data is None:
+                document_info = zipfile.ZipInfo(DOCUMENT_PART, date_time=info.date_time)
+                document_info.compress_type = zipfile.ZIP_DEFLATED
+                self._document = self._package.open(document_info, "w")
+                break
+            self._package.writestr(info, data, zipfile.ZIP_DEFLATED)
+        self._pending = [head]
+        self._pending_chars = len(head)
+
+    def write(self, fragment):
+        self._pending.append(fragment)
+        self._pending_chars += len(fragment)
+        if self._pending_chars >= FLUSH_CHARS:
+            self._flush()
+
+    def _flush(self):
+        self._document.write("".join(self._pending).encode("utf-8"))
+        self._pending = []
+        self._pending_chars = 0
+
+    def save(self):
+        """Finish the package; returns a BytesIO positioned at its start."""
+        self.write(self._tail)
+        self._flush()
+        self._document.close()
+        for info, data in self._remaining:
+            self._package.writestr(info, data, zipfile.ZIP_DEFLATED)
+        self._package.close()
+        self._buffer.seek(0)
+        return self._buffer
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_template(sys.argv[1] if len(sys.argv) > 1 else TEMPLATE_PATH)}")
@@ -0,0 +1,646 @@
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+from timing import NULL_TIMER
+from xml_loader import iter_competition
+
+UNKNOWN_FENCER = {"Name": "Unknown", "Nation": "Unknown"}
+DEFAULT_NATION = "QAT"
+# Bump whenever loading or extraction output changes, so stored snapshots
+# (see snapshot.py) of older output are not reused
+PARSER_VERSION = 2
+
+# Country and adjective used in report text; other nations use their code
+NATION_NAMES = {"QAT": ("Qatar", "Qatari")}
+
+
+def nation_names(nation):
+    return NATION_NAMES.get(nation, (nation, nation))
+
+
+def iter_relay_legs(bouts):
+    """Yield (ref_d, score_d, touches_d, ref_g, score_g, touches_g) per leg.
+
+    Relay scores are cumulative, so the touches of a leg are the difference
+    from the previous leg's score on the same side.
+    """
+    prev_score_1, prev_score_2 = 0, 0
+    for _, fencer_d_ref, score_d, fencer_g_ref, score_g in bouts:
+        yield fencer_d_ref, score_d, score_d - prev_score_1, fencer_g_ref, score_g, score_g - prev_score_2
+        prev_score_1, prev_score_2 = score_d, score_g
+
+
+def bout_outcome(touches, touches_against):
+    return "Victory" if touches > touches_against else "Defeat" if touches < touches_against else "Draw"
+
+
+STAGE_COLUMNS = ["Team_1", "Fencer_1", "Touches_1", "Score_1", "Score_2", "Touches_2", "Fencer_2", "Team_2"]
+TOTALS_COLUMNS = ["Fencer", "Scored", "Conceded", "Total"]
+OUTCOMES = ["Victory", "Defeat", "Draw"]
+OUTCOME_COLUMNS = ["Fencer", "Opponent Team"] + OUTCOMES
+# Individual events: one row per poule or DE bout, the winner's score
+# marked "V" as on a poule sheet, and outcomes against opponent nations
+INDIVIDUAL_STAGE_COLUMNS = ["Fencer_1", "Nation_1", "Score_1", "Score_2", "Nation_2", "Fencer_2"]
+INDIVIDUAL_OUTCOME_COLUMNS = ["Fencer", "Opponent Nation"] + OUTCOMES
+# Poule indicators: victories, bouts, their ratio, touches scored and
+# received, and the index TD - TR
+INDICATOR_COLUMNS = ["Fencer", "V", "M", "V/M", "TD", "TR", "Ind"]
+# Shared by every nation without bouts; nothing modifies these in place
+EMPTY_STAGE_ROWS = pd.DataFrame(columns=STAGE_COLUMNS)
+EMPTY_TOTALS = pd.DataFrame(columns=TOTALS_COLUMNS)
+EMPTY_OUTCOMES = pd.DataFrame(columns=OUTCOME_COLUMNS)
+EMPTY_FENCER_OUTCOMES = pd.DataFrame(columns=OUTCOME_COLUMNS[1:])
+EMPTY_INDICATORS = pd.DataFrame(columns=INDICATOR_COLUMNS)
+
+# What a competition's entrants are, by the "kind" extraction reports
+ENTRANT_LABELS = {"team": "Teams", "individual": "Fencers"}
+
+# Parts of the Word report, in document order; word_export renders all of
+# them unless given a subset. Kept here so choosing sections does not load
+# python-docx.
+REPORT_SECTIONS = ("overview", "tables", "review", "rankings")
+
+
+def _new_nation_index():
+    # Everything the report needs about one nation, filled during extraction.
+    # "stage_rows" holds the nation's bout rows grouped by stage in "stages"
+    # order, and stage i spans rows stage_bounds[i]:stage_bounds[i + 1];
+    # stage_tables() cuts it into the per-stage tables.
+    return {
+        "teams": [],
+        "fencers": [],
+        "matches": [],
+        "stages": {},
+        "stage_rows": EMPTY_STAGE_ROWS,
+        "stage_bounds": np.zeros(1, dtype=np.int64),
+        "fencer_totals": EMPTY_TOTALS,
+        "fencer_outcomes": EMPTY_OUTCOMES,
+        "poule_indicators": EMPTY_INDICATORS,
+    }
+
+
+def _runs(values):
+    # (start, stop) of each run of equal consecutive values
+    values = np.asarray(values)
+    if not len(values):
+        return []
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    return zip(starts.tolist(), np.r_[starts[1:], len(values)].tolist())
+
+
+def _objects(values):
+    # Plain object columns slice and copy much faster than Arrow-backed strings
+    return pd.Series(values, dtype=object)
+
+# ---------------------------
+# Single-Pass Extraction Engine
+# ---------------------------
+class CompetitionExtractor:
+    """Fills every report structure from one walk over the loader's records.
+
+    Each team, ranking and match record is visited exactly once. Bouts are
+    only collected into columns during the walk; touches, outcomes, stage
+    tables and fencer summaries for every indexed nation are then computed
+    in bulk on one frame when the result is read, so reports for all
+    nations cost the same work as for one.
+    ``nations`` restricts the per-nation index (None indexes every nation).
+    Ophardt files list <Equipes> before <Phases>, so teams and fencers are
+    known by the time matches arrive; rankings are only resolved against
+    team_dict when the result is read, which keeps them independent of file
+    order.
+    Individual events (CompetitionIndividuelle) take the same path with
+    fencer and bout records instead: each poule or DE bout is one row, and
+    fencers' poule bouts also give their poule indicators.
+    """
+
+    def __init__(self, fencer_dict=None, team_dict=None, nations=None):
+        self.info = {}
+        self.kind = "team"
+        self.fencer_dict = {} if fencer_dict is None else fencer_dict
+        self.team_dict = {} if team_dict is None else team_dict
+        self.nations = None if nations is None else set(nations)
+        self.ranking_refs = []
+        self.nation_index = defaultdict(_new_nation_index)
+        # One entry per kept match: (team_d name, team_g name, stage, nations)
+        self.match_records = []
+        self.bout_columns = {"match": [], "ref_d": [], "score_d": [], "ref_g": [], "score_g": []}
+        # Individual bouts, one entry per bout with fencers 1 and 2 in file order
+        self.individual_columns = {
+            "match": [], "poule": [], "ref_1": [], "score_1": [], "status_1": [], "ref_2": [], "score_2": [], "status_2": []
+        }
+
+    def add(self, kind, data):
+        if kind == "match":
+            self.add_match(data)
+        elif kind == "team":
+            self.add_team(data)
+        elif kind == "ranking":
+            self.add_ranking(data)
+        elif kind == "bout":
+            self.add_bout(data)
+        elif kind == "fencer":
+            self.add_fencer(data)
+        else:
+            self.info = data
+
+    def add_team(self, team):
+        equipe = team["attrib"]
+        team_id = equipe.get('ID')
+        nation = equipe.get('Nation')
+        team_name = equipe.get('IdOrigine') if team_id and team_id.isdigit() else team_id
+        if not team_id or not nation or not team_name:
+            return
+
+        index = self.nation_index[nation]
+        if team_id not in self.team_dict:
+            index["teams"].append(team_id)
+        self.team_dict[team_id] = {"Team Name": team_name, "Nation": nation}
+
+        for tireur in team["fencers"]:
+            fencer_id = tireur.get('ID')
+            if fencer_id not in self.fencer_dict:
+                index["fencers"].append(fencer_id)
+            self.fencer_dict[fencer_id] = {
+                "Name": f"{tireur.get('Prenom')} {tireur.get('Nom')}",
+                "Date of Birth": tireur.get("DateNaissance", "Unknown"),
+                "Lateralite": tireur.get("Lateralite", "Unknown"),
+                "EquipeID": team_id,
+                "Nation": nation,
+                "Team Name": team_name
+            }
+
+    def add_ranking(self, equipe):
+        team_id = equipe.get('REF')
+        final_rank = equipe.get('RangFinal')
+        if team_id and final_rank:
+            self.ranking_refs.append((team_id, int(final_rank)))
+
+    def match_nations(self, teams):
+        # Indexed nations of the match's known teams
+        nations = set()
+        for side in ("D", "G"):
+            team = self.team_dict.get(teams.get(side))
+            if team and (self.nations is None or team["Nation"] in self.nations):
+                nations.add(team["Nation"])
+        return nations
+
+    def wants_match(self, teams):
+        return bool(self.match_nations(teams))
+
+    def add_match(self, match):
+        nations = self.match_nations(match["teams"])
+        if not nations:
+            return
+        team_d = self.team_dict.get(match["teams"].get("D"))
+        team_g = self.team_dict.get(match["teams"].get("G"))
+        team_d_name = team_d["Team Name"] if team_d else "Unknown Team"
+        team_g_name = team_g["Team Name"] if team_g else "Unknown Team"
+
+        match_idx = self._record_match(match, nations, team_d_name, team_g_name)
+        bouts = match["bouts"]
+        if bouts:
+            _, refs_d, scores_d, refs_g, scores_g = zip(*bouts)
+            columns = self.bout_columns
+            columns["match"].extend([match_idx] * len(bouts))
+            columns["ref_d"].extend(refs_d)
+            columns["score_d"].extend(scores_d)
+            columns["ref_g"].extend(refs_g)
+            columns["score_g"].extend(scores_g)
+
+    def _record_match(self, match, nations, team_d_name=None, team_g_name=None):
+        match_idx = len(self.match_records)
+        self.match_records.append((team_d_name, team_g_name, match["stage"], nations))
+        for nation in nations:
+            index = self.nation_index[nation]
+            index["matches"].append((match["stage"], match["tableau"], match["attrib"].get("ID")))
+            # Stage tables keep the order in which each nation first meets a stage
+            index["stages"].setdefault(match["stage"], len(index["stages"]))
+        return match_idx
+
+    # -- individual events ---------------------------------------------------
+    def add_fencer(self, tireur):
+        self.kind = "individual"
+        fencer_id = tireur.get("ID")
+        nation = tireur.get("Nation")
+        if not fencer_id or not nation:
+            return
+        index = self.nation_index[nation]
+        if fencer_id not in self.fencer_dict:
+            index["fencers"].append(fencer_id)
+        self.fencer_dict[fencer_id] = {
+            "Name": f"{tireur.get('Prenom')} {tireur.get('Nom')}",
+            "Date of Birth": tireur.get("DateNaissance", "Unknown"),
+            "Lateralite": tireur.get("Lateralite", "Unknown"),
+            "Club": tireur.get("Club", "Unknown"),
+            "Nation": nation,
+        }
+        final_rank = tireur.get("Classement")
+        if final_rank and final_rank.isdigit():
+            self.ranking_refs.append((fencer_id, int(final_rank)))
+
+    def bout_nations(self, fencer_refs):
+        # Indexed nations of the bout's known fencers
+        nations = set()
+        for ref in fencer_refs:
+            fencer = self.fencer_dict.get(ref)
+            if fencer and (self.nations is None or fencer["Nation"] in self.nations):
+                nations.add(fencer["Nation"])
+        return nations
+
+    def wants_bout(self, fencer_refs):
+        return bool(self.bout_nations(fencer_refs))
+
+    def add_bout(self, bout):
+        (ref_1, score_1, status_1), (ref_2, score_2, status_2) = bout["fencers"]
+        nations = self.bout_nations((ref_1, ref_2))
+        if not nations:
+            return
+        columns = self.individual_columns
+        columns["match"].append(self._record_match(bout, nations))
+        columns["poule"].append(bout["phase"] == "poule")
+        columns["ref_1"].append(ref_1)
+        columns["score_1"].append(score_1)
+        columns["status_1"].append(status_1)
+        columns["ref_2"].append(ref_2)
+        columns["score_2"].append(score_2)
+        columns["status_2"].append(status_2)
+
+    def build_individual_tables(self):
+        # Stage rows, fencer summaries and poule indicators of every indexed
+        # nation, in bulk, from one row per bout
+        columns = self.individual_columns
+        match_idx = np.asarray(columns["match"], dtype=np.int64)
+        names = {ref: fencer["Name"] for ref, fencer in self.fencer_dict.items()}
+        fencer_nations = {ref: fencer["Nation"] for ref, fencer in self.fencer_dict.items()}
+        sides = {}
+        for side in ("1", "2"):
+            refs = columns[f"ref_{side}"]
+            sides[side] = {
+                "score": np.asarray(columns[f"score_{side}"], dtype=np.int64),
+                "status": np.asarray(columns[f"status_{side}"], dtype=object),
+                "fencer": np.array([names.get(ref, UNKNOWN_FENCER["Name"]) for ref in refs], dtype=object),
+                "nation": np.array([fencer_nations.get(ref, UNKNOWN_FENCER["Nation"]) for ref in refs], dtype=object),
+            }
+        # The Statut attribute decides bouts won on priority or by abandon;
+        # without one the higher score wins
+        for side, other in (("1", "2"), ("2", "1")):
+            this, that = sides[side], sides[other]
+            this["won"] = (this["status"] == "V") | ((that["status"] != "V") & (this["score"] > that["score"]))
+        for side, other in (("1", "2"), ("2", "1")):
+            this, that = sides[side], sides[other]
+            this["outcome"] = np.select([this["won"], that["won"]], OUTCOMES[:2], OUTCOMES[2])
+
+        def marked_score(side):
+            score = sides[side]["score"].astype(str).astype(object)
+            return _objects(np.where(sides[side]["won"], "V" + score, score))
+
+        self._index_stage_rows(pd.DataFrame({
+            "match": match_idx,
+            "Fencer_1": _objects(sides["1"]["fencer"]),
+            "Nation_1": _objects(sides["1"]["nation"]),
+            "Score_1": marked_score("1"),
+            "Score_2": marked_score("2"),
+            "Nation_2": _objects(sides["2"]["nation"]),
+            "Fencer_2": _objects(sides["2"]["fencer"]),
+        }), INDIVIDUAL_STAGE_COLUMNS)
+
+        position = np.arange(len(match_idx)) * 2
+        poule = np.asarray(columns["poule"], dtype=bool)
+        first_nation, last_nation = self._match_nation_bounds(match_idx)
+        frames = []
+        for side, other, offset in (("1", "2", 0), ("2", "1", 1)):
+            this, that = sides[side], sides[other]
+            keep = (this["nation"] == first_nation) | (this["nation"] == last_nation)
+            frames.append(pd.DataFrame({
+                "order": position[keep] + offset,
+                "nation": _objects(this["nation"][keep]),
+                "Fencer": _objects(this["fencer"][keep]),
+                "Scored": this["score"][keep],
+                "Conceded": that["score"][keep],
+                "Opponent Nation": _objects(that["nation"][keep]),
+                "Outcome": _objects(this["outcome"][keep]),
+                "poule": poule[keep],
+            }))
+        fencer_bouts = pd.concat(frames, ignore_index=True).sort_values("order", kind="stable")
+        self._index_fencer_bouts(fencer_bouts, INDIVIDUAL_OUTCOME_COLUMNS)
+
+        poule_bouts = fencer_bouts[fencer_bouts["poule"]].assign(
+            V=lambda frame: frame["Outcome"] == "Victory"
+        )
+        indicators = (
+            poule_bouts.groupby(["nation", "Fencer"], sort=False)
+            .agg(V=("V", "sum"), M=("V", "size"), TD=("Scored", "sum"), TR=("Conceded", "sum"))
+            .reset_index()
+        )
+        indicators["V/M"] = (indicators["V"] / indicators["M"]).round(3)
+        indicators["Ind"] = indicators["TD"] - indicators["TR"]
+        self._index_frames(indicators.sort_values("nation", kind="stable"), "poule_indicators", INDICATOR_COLUMNS)
+
+    # -- team events ---------------------------------------------------------
+    def bout_frame(self):
+        """All collected relay legs as one frame, one row per Assaut.
+
+        Scores are cumulative within a match, so each leg's touches are the
+        score minus the previous leg's score in the same match.
+        """
+        columns = self.bout_columns
+        match_idx = np.asarray(columns["match"], dtype=np.int64)
+        position = np.arange(len(match_idx))
+        first_leg = np.r_[True, match_idx[1:] != match_idx[:-1]] if len(match_idx) else position.astype(bool)
+        frame = {
+            "match": match_idx,
+            "leg": position - np.maximum.accumulate(np.where(first_leg, position, 0)) + 1,
+        }
+        for side in ("d", "g"):
+            score = np.asarray(columns[f"score_{side}"], dtype=np.int64)
+            previous = np.r_[0, score[:-1]] if len(score) else score
+            frame[f"score_{side}"] = score
+            frame[f"touches_{side}"] = score - np.where(first_leg, 0, previous)
+
+        names = {ref: fencer["Name"] for ref, fencer in self.fencer_dict.items()}
+        fencer_nations = {ref: fencer["Nation"] for ref, fencer in self.fencer_dict.items()}
+        records = self.match_records
+        for side, team_col in (("d", 0), ("g", 1)):
+            team_names = np.array([record[team_col] for record in records] or [""], dtype=object)
+            refs = columns[f"ref_{side}"]
+            frame[f"team_{side}"] = _objects(team_names[match_idx])
+            frame[f"fencer_{side}"] = _objects([names.get(ref, UNKNOWN_FENCER["Name"]) for ref in refs])
+            frame[f"nation_{side}"] = _objects([fencer_nations.get(ref, UNKNOWN_FENCER["Nation"]) for ref in refs])
+        return pd.DataFrame(frame)
+
+    def build_bout_tables(self):
+        # Stage rows and fencer summaries of every indexed nation, in bulk
+        bouts = self.bout_frame()
+        diff = bouts["touches_d"] - bouts["touches_g"]
+        self._index_stage_rows(pd.DataFrame({
+            "match": bouts["match"],
+            "Team_1": bouts["team_d"],
+            "Fencer_1": bouts["fencer_d"],
+            "Touches_1": _objects(bouts["touches_d"].astype(str) + " (" + diff.astype(str) + ")"),
+            "Score_1": bouts["score_d"],
+            "Score_2": bouts["score_g"],
+            "Touches_2": _objects(bouts["touches_g"].astype(str) + " (" + (-diff).astype(str) + ")"),
+            "Fencer_2": bouts["fencer_g"],
+            "Team_2": bouts["team_g"],
+        }), STAGE_COLUMNS)
+
+        # Each leg seen from both fencers, kept only for fencers of the match's
+        # nations; "order" restores bout order with the D side first.
+        position = np.arange(len(bouts)) * 2
+        first_nation, last_nation = self._match_nation_bounds(bouts["match"].to_numpy())
+        sides = []
+        for side, other, offset in (("d", "g", 0), ("g", "d", 1)):
+            nation = bouts[f"nation_{side}"].to_numpy()
+            keep = (nation == first_nation) | (nation == last_nation)
+            scored = bouts[f"touches_{side}"].to_numpy()[keep]
+            conceded = bouts[f"touches_{other}"].to_numpy()[keep]
+            sides.append(pd.DataFrame({
+                "order": position[keep] + offset,
+                "nation": _objects(nation[keep]),
+                "Fencer": _objects(bouts[f"fencer_{side}"].to_numpy()[keep]),
+                "Scored": scored,
+                "Conceded": conceded,
+                "Opponent Team": _objects(bouts[f"team_{other}"].to_numpy()[keep]),
+                "Outcome": _objects(np.select([scored > conceded, scored < conceded], OUTCOMES[:2], OUTCOMES[2])),
+            }))
+        fencer_bouts = pd.concat(sides, ignore_index=True).sort_values("order", kind="stable")
+        self._index_fencer_bouts(fencer_bouts, OUTCOME_COLUMNS)
+
+    def _match_nation_bounds(self, match_idx):
+        # Per bout, the first and last of its match's (at most two) nations
+        match_nations = [sorted(record[3]) for record in self.match_records] or [[None]]
+        first_nation = np.array([nations[0] for nations in match_nations], dtype=object)[match_idx]
+        last_nation = np.array([nations[-1] for nations in match_nations], dtype=object)[match_idx]
+        return first_nation, last_nation
+
+    def _index_stage_rows(self, stage_rows, columns):
+        # A match's rows are filed under each nation taking part in it, in
+        # one frame per nation ordered by that nation's stage order
+        membership = pd.DataFrame(
+            [(match_idx, nation) for match_idx, record in enumerate(self.match_records) for nation in record[3]],
+            columns=["match", "nation"],
+        )
+        # Position of each match's stage in each of its nations' stage order
+        membership["stage_pos"] = [
+            self.nation_index[nation]["stages"][self.match_records[match_idx][2]]
+            for match_idx, nation in zip(membership["match"], membership["nation"])
+        ]
+        # The stable sort keeps bout order within each stage
+        per_nation = (
+            membership.merge(stage_rows, on="match")
+            .sort_values(["nation", "stage_pos"], kind="stable")
+        )
+        nations = per_nation["nation"].to_numpy()
+        stage_pos = per_nation["stage_pos"].to_numpy()
+        per_nation = per_nation[columns]
+        for start, stop in _runs(nations):
+            index = self.nation_index[nations[start]]
+            index["stage_rows"] = per_nation.iloc[start:stop].reset_index(drop=True)
+            index["stage_bounds"] = np.searchsorted(stage_pos[start:stop], np.arange(len(index["stages"]) + 1))
+
+    def _index_fencer_bouts(self, fencer_bouts, outcome_columns):
+        # Totals and per-opponent outcomes of each nation's fencers, from one
+        # row per bout and fencer in bout order
+        opponent = outcome_columns[1]
+        totals = fencer_bouts.groupby(["nation", "Fencer"], sort=False)[["Scored", "Conceded"]].sum().reset_index()
+        totals["Total"] = totals["Scored"] - totals["Conceded"]
+        totals = totals.sort_values("nation", kind="stable")
+        outcomes = (
+            fencer_bouts
+            .groupby(["nation", "Fencer", opponent, "Outcome"])
+            .size()
+            .unstack(fill_value=0)
+            .reindex(columns=OUTCOMES, fill_value=0)
+            .reset_index()
+        )
+        outcomes.columns.name = None
+        self._index_frames(totals, "fencer_totals", TOTALS_COLUMNS)
+        self._index_frames(outcomes, "fencer_outcomes", outcome_columns)
+
+    def _index_frames(self, frame, key, columns):
+        # Cuts a frame sorted by nation into each nation's index entry
+        nations = frame["nation"].to_numpy()
+        frame = frame[columns]
+        for start, stop in _runs(nations):
+            self.nation_index[nations[start]][key] = frame.iloc[start:stop].reset_index(drop=True)
+
+    def final_rankings(self):
+        if self.kind == "individual":
+            rankings = [
+                {
+                    "Name": self.fencer_dict[fencer_id]["Name"],
+                    "Nation": self.fencer_dict[fencer_id]["Nation"],
+                    "Final Rank": final_rank
+                }
+                for fencer_id, final_rank in self.ranking_refs
+            ]
+            return pd.DataFrame(rankings, columns=["Name", "Nation", "Final Rank"]).sort_values(
+                by="Final Rank", kind="stable").reset_index(drop=True)
+        rankings = []
+        for team_id, final_rank in self.ranking_refs:
+            team = self.team_dict.get(team_id, {})
+            rankings.append({
+                "Team Name": team.get("Team Name", team_id),
+                "Nation": team.get("Nation", "Unknown"),
+                "Final Rank": final_rank
+            })
+        # Columns are given so a live file with no final ranks yet gives an empty table
+        return pd.DataFrame(rankings, columns=["Team Name", "Nation", "Final Rank"]).sort_values(
+            by="Final Rank").reset_index(drop=True)
+
+    def result(self, timer=NULL_TIMER):
+        with timer.stage("generate_tables_data") as counts:
+            if self.kind == "individual":
+                self.build_individual_tables()
+                counts["bouts"] = len(self.individual_columns["match"])
+            else:
+                self.build_bout_tables()
+                counts["bouts"] = len(self.bout_columns["match"])
+        with timer.stage("extract_final_rankings") as counts:
+            final_rankings_df = self.final_rankings()
+            counts["rankings"] = len(final_rankings_df)
+        return {
+            "kind": self.kind,
+            "info": self.info,
+            "fencer_dict": self.fencer_dict,
+            "team_dict": self.team_dict,
+            "final_rankings_df": final_rankings_df,
+            "nations": dict(self.nation_index),
+        }
+
+
+def extract_competition(source, nations=None, timer=NULL_TIMER):
+    """Parse and extract a results file (path or binary file) in one pass.
+
+    ``nations`` limits the per-nation index to those nations; matches none
+    of them take part in are dropped by the loader before their bouts are
+    read.
+    """
+    extractor = CompetitionExtractor(nations=nations)
+    # Teams and fencers are indexed during the stream, so this stage covers
+    # parsing and build_fencer_dict_and_team_dict together.
+    with timer.stage("stream records") as counts:
+        records = iter_competition(source, match_filter=extractor.wants_match, bout_filter=extractor.wants_bout)
+        for kind, data in records:
+            extractor.add(kind, data)
+        counts.update(
+            teams=len(extractor.team_dict),
+            fencers=len(extractor.fencer_dict),
+            matches=len(extractor.match_records),
+        )
+    return extractor.result(timer)
+
+
+def nation_view(competition, nation):
+    # The nation's index entry, or an empty one if it did not take part
+    return competition["nations"].get(nation) or _new_nation_index()
+
+
+def competition_nations(competition):
+    return sorted(competition["nations"])
+
+
+def stage_tables(view):
+    # {stage title: DataFrame of its bouts} for one nation, in stage order
+    rows, bounds = view["stage_rows"], view["stage_bounds"].tolist()
+    return {
+        stage: rows.iloc[start:stop].reset_index(drop=True)
+        for stage, start, stop in zip(view["stages"], bounds[:-1], bounds[1:])
+    }
+
+# ---------------------------
+# Data Extraction Functions
+# ---------------------------
+# Per-structure entry points over a competition from
+# xml_loader.load_competition, kept for callers that only need one of them.
+def build_fencer_dict_and_team_dict(competition):
+    extractor = CompetitionExtractor()
+    for team in competition["teams"]:
+        extractor.add_team(team)
+    return extractor.fencer_dict, extractor.team_dict
+
+def extract_final_rankings(competition, team_dict):
+    extractor = CompetitionExtractor(team_dict=team_dict)
+    for equipe in competition["rankings"]:
+        extractor.add_ranking(equipe)
+    return extractor.final_rankings()
+
+def generate_tables_data(competition, team_dict, fencer_dict, nation=DEFAULT_NATION):
+    extractor = CompetitionExtractor(fencer_dict=fencer_dict, team_dict=team_dict, nations=[nation])
+    for match in competition["matches"]:
+        extractor.add_match(match)
+    extractor.build_bout_tables()
+    index = extractor.nation_index[nation]
+    return stage_tables(index), generate_nation_summary(index["fencer_totals"], index["fencer_outcomes"])
+
+def generate_nation_summary(fencer_totals, fencer_outcomes):
+    # Splits the nation's bulk-computed frames into one entry per fencer
+    fencers = fencer_outcomes["Fencer"].to_numpy()
+    outcome_rows = fencer_outcomes.drop(columns="Fencer")
+    outcomes_by_fencer = {
+        fencers[start]: outcome_rows.iloc[start:stop].reset_index(drop=True)
+        for start, stop in _runs(fencers)
+    }
+    nation_summary = []
+    for fencer, scored, conceded, total in fencer_totals.itertuples(index=False):
+        nation_summary.append({
+            "Fencer": fencer,
+            "Scored": int(scored),
+            "Conceded": int(conceded),
+            "Total": int(total),
+            "Outcomes": outcomes_by_fencer.get(fencer, EMPTY_FENCER_OUTCOMES)
+        })
+    return nation_summary
+
+def get_nation_fencers_table(fencer_dict, fencer_ids):
+    # fencer_ids comes from the nation index, so no scan of fencer_dict
+    df = pd.DataFrame([fencer_dict[fencer_id] for fencer_id in fencer_ids])
+    # Ensure the expected columns exist even if no data is present.
+    for col in ["Name", "Date of Birth"]:
+        if col not in df.columns:
+            df[col] = pd.Series(dtype='str')
+    return df
+
+def get_country_team_counts(team_dict, entrants="Teams"):
+    country_team_count = defaultdict(int)
+    for details in team_dict.values():
+        nation = details['Nation']
+        if nation and len(nation) == 3:
+            country_team_count[nation] += 1
+    team_count_df = pd.DataFrame(list(country_team_count.items()), columns=["Country", f"Number of {entrants}"])
+    return len(team_dict), len({d['Nation'] for d in team_dict.values()}), team_count_df
+
+def summarise_competition(competition, nation=DEFAULT_NATION):
+    # Derived tables shown in the app and the Word report for one nation
+    view = nation_view(competition, nation)
+    kind = competition.get("kind", "team")
+    # Individual events count fencers where team events count teams
+    entrants = competition["fencer_dict"] if kind == "individual" else competition["team_dict"]
+    num_teams, num_countries, team_count_df = get_country_team_counts(entrants, ENTRANT_LABELS[kind])
+    return {
+        "nation": nation,
+        "kind": kind,
+        "tables_data": stage_tables(view),
+        "nation_summary": generate_nation_summary(view["fencer_totals"], view["fencer_outcomes"]),
+        "nation_fencers_df": get_nation_fencers_table(competition["fencer_dict"], view["fencers"])[["Name", "Date of Birth"]],
+        "num_teams": num_teams,
+        "num_countries": num_countries,
+        "team_count_df": team_count_df,
+        "poule_indicators": view["poule_indicators"],
+    }
+
+def build_overview_data(info, num_teams, num_countries):
+    # Human-readable competition details from the root element's attributes
+    return {
+        "Year": info.get("Annee", "Unknown Year"),
+        "Tournament": info.get("TitreCourtTournoi") or info.get("TitreCourt") or "Unknown Tournament",
+        "Championship": info.get("Championnat", "Unknown Championship"),
+        "Category": "Cadet" if info.get("Categorie") == "C" else "Junior" if info.get("Categorie") == "J" else info.get("Categorie"),
+        "Weapon": "Epee" if info.get("Arme") == "E" else "Sabre" if info.get("Arme") == "S" else "Foil" if info.get("Arme") == "F" else info.get("Arme"),
+        "Gender": "Male" if info.get("Sexe") == "M" else "Female" if info.get("Sexe") == "F" else info.get("Sexe"),
+        "Date": info.get("Date", "Unknown Date"),
+        "Location": info.get("Lieu", "Unknown Location"),
+        "Num Teams": num_teams,
+        "Num Countries": num_countries
+    }
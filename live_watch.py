@@ -0,0 +1,445 @@
+"""Incremental report state for a results file that is rewritten live.
+
+During an event the Ophardt software rewrites the whole XML file as
+matches finish. LiveCompetition follows one such file: each refresh splits
+the cleaned bytes into <Match> elements, keyed by Tableau ID + Match ID,
+and a skeleton holding everything else (competition, teams, rankings).
+Only new or changed matches are parsed; their stage rows and touch
+contributions replace the old ones in running per-nation totals, and only
+the stage tables they touch are rebuilt, the next time they are viewed.
+Each nation's matches, overall and per stage, are kept in document order
+as they are added and removed, so the report structures are read without
+sorting. Apart from one scan of the file's bytes (splitting out and
+hashing every match), the work per refresh depends on what changed, not
+on how far into the event the file is.
+
+Individual events (CompetitionIndividuelle) are re-extracted in full on
+each change.
+"""
+import bisect
+import hashlib
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter, defaultdict
+from io import BytesIO
+
+import pandas as pd
+from lxml import etree
+
+from extraction import (
+    EMPTY_INDICATORS,
+    OUTCOMES,
+    STAGE_COLUMNS,
+    UNKNOWN_FENCER,
+    CompetitionExtractor,
+    bout_outcome,
+    get_country_team_counts,
+    get_nation_fencers_table,
+    iter_relay_legs,
+    summarise_competition,
+)
+from xml_loader import INDIVIDUAL_ROOT, iter_clean_chunks, iter_competition, parse_match
+
+MATCH_START = re.compile(rb"<Match\b[^>]*>")
+MATCH_END = re.compile(rb"</Match\s*>")
+TABLEAU_START = re.compile(rb"<Tableau\b[^>]*>")
+TABLEAU_END = re.compile(rb"</Tableau\s*>")
+SUITE_START = re.compile(rb"<SuiteDeTableaux\b[^>]*>")
+SUITE_END = re.compile(rb"</SuiteDeTableaux\s*>")
+MATCH_ID = re.compile(rb'\bID="([^"]*)"')
+ROOT_TAG = re.compile(rb"<([A-Za-z_][\w.:-]*)")
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _spans(start_pattern, end_pattern, data):
+    # (start, end) of same-tag elements that do not nest, in document order;
+    # self-closing ones are empty and skipped
+    starts = [m.start() for m in start_pattern.finditer(data) if not m.group().endswith(b"/>")]
+    ends = [m.end() for m in end_pattern.finditer(data)]
+    return list(zip(starts, ends))
+
+
+def _match_spans(data):
+    # Matches do not nest, so each start tag pairs with the next end tag;
+    # two literal scans are much faster than one lazy regex over the file
+    ends = iter(MATCH_END.finditer(data))
+    end = 0
+    for start in MATCH_START.finditer(data):
+        if start.start() < end:
+            continue
+        if start.group().endswith(b"/>"):
+            end = start.end()
+        else:
+            for close in ends:
+                if close.start() > start.start():
+                    end = close.end()
+                    break
+            else:
+                raise ET.ParseError("unclosed Match element")
+        yield start.start(), end
+
+
+def _enclosing_span(spans, starts, position):
+    index = bisect.bisect_right(starts, position) - 1
+    if index >= 0 and spans[index][1] > position:
+        return index
+    return None
+
+
+def _start_tag_attrib(tag):
+    # Attributes of a start tag, with entities resolved by lxml
+    if not tag.endswith(b"/>"):
+        tag = tag[:-1] + b"/>"
+    return etree.fromstring(tag, etree.XMLParser(resolve_entities=False, no_network=True)).attrib
+
+
+def _outcome_table(outcomes):
+    # Same layout as the bulk engine: one row per opponent team, sorted
+    rows = defaultdict(lambda: dict.fromkeys(OUTCOMES, 0))
+    for (opponent, outcome), count in outcomes.items():
+        if count:
+            rows[opponent][outcome] = count
+    return pd.DataFrame(
+        [{"Opponent Team": opponent, **rows[opponent]} for opponent in sorted(rows)],
+        columns=["Opponent Team"] + OUTCOMES,
+    )
+
+
+# ---------------------------
+# Live Competition State
+# ---------------------------
+class LiveCompetition:
+    """Report structures for one results file, updated match by match."""
+
+    def __init__(self, path):
+        self.path = path
+        self.revision = 0
+        self.last_refresh = None
+        self._stat = None
+        self._skeleton_digest = None
+        self.base = None  # competition dict from the skeleton, no matches
+        self.extractor = CompetitionExtractor()
+        self.matches = {}  # (tableau ID, match ID) -> per-match state
+        # Match keys in document order: nation -> keys, and nation -> stage -> keys;
+        # nation_refs holds the (stage, tableau, match ID) of nation_matches' keys
+        self.nation_matches = defaultdict(list)
+        self.nation_refs = defaultdict(list)
+        self.stage_matches = defaultdict(lambda: defaultdict(list))
+        self._competition = None  # (revision, competition dict)
+        self.stage_tables = defaultdict(dict)  # nation -> stage -> DataFrame, built when viewed
+        self.touches = defaultdict(dict)  # nation -> fencer name -> running totals
+
+    # -- change detection --------------------------------------------------
+    def _file_stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def file_changed(self):
+        try:
+            return self._file_stat() != self._stat
+        except OSError:
+            return False
+
+    def revision_key(self):
+        return f"live:{os.path.abspath(self.path)}:{self.revision}"
+
+    def refresh(self):
+        """Pick up changes to the file.
+
+        Returns counts of added, changed and removed matches, or None when
+        the file is unchanged or only partly written (the previous state is
+        kept and the next refresh tries again).
+        """
+        try:
+            stat = self._file_stat()
+        except OSError:
+            return None
+        if stat == self._stat:
+            return None
+        started = time.perf_counter()
+        with open(self.path, "rb") as handle:
+            data = b"".join(iter_clean_chunks(handle))
+        root = ROOT_TAG.search(data)
+        if root is None or not data[-1024:].rstrip().endswith(b"</" + root.group(1) + b">"):
+            return None  # Still being written
+        try:
+            changes = self._apply(data, individual=root.group(1).decode() == INDIVIDUAL_ROOT)
+        except (ET.ParseError, etree.XMLSyntaxError, UnicodeDecodeError):
+            return None
+        self._stat = stat
+        self.revision += 1
+        self.last_refresh = time.time()
+        changes["seconds"] = time.perf_counter() - started
+        return changes
+
+    # -- splitting -----------------------------------------------------------
+    def _split(self, data):
+        # Match spans that the loader would report, keyed by Tableau + Match ID
+        tableaux = _spans(TABLEAU_START, TABLEAU_END, data)
+        tableau_starts = [start for start, _ in tableaux]
+        suites = _spans(SUITE_START, SUITE_END, data)
+        suite_starts = [start for start, _ in suites]
+        tableau_attrib = {}
+        matches = []
+        skeleton = []
+        previous_end = 0
+        for start, end in _match_spans(data):
+            skeleton.append(data[previous_end:start])
+            previous_end = end
+            tableau_index = _enclosing_span(tableaux, tableau_starts, start)
+            if tableau_index is None:
+                continue
+            tableau_start = tableaux[tableau_index][0]
+            if _enclosing_span(suites, suite_starts, tableau_start) is None:
+                continue
+            if tableau_index not in tableau_attrib:
+                tag_end = data.index(b">", tableau_start) + 1
+                tableau_attrib[tableau_index] = _start_tag_attrib(data[tableau_start:tag_end])
+            attrib = tableau_attrib[tableau_index]
+            span = data[start:end]
+            match_id = MATCH_ID.search(span, 0, span.index(b">") + 1)
+            key = (attrib.get("ID"), match_id.group(1).decode() if match_id else str(start))
+            matches.append((key, span, attrib.get("Titre", "Unknown Stage"), attrib.get("ID")))
+        skeleton.append(data[previous_end:])
+        return matches, b"".join(skeleton)
+
+    # -- applying changes ----------------------------------------------------
+    def _load_skeleton(self, skeleton):
+        extractor = CompetitionExtractor()
+        for kind, record in iter_competition(BytesIO(skeleton)):
+            extractor.add(kind, record)
+        return extractor, extractor.result()
+
+    def _apply(self, data, individual=False):
+        # Everything is parsed before any state changes, so a file that
+        # fails to parse leaves the previous report intact.
+        matches, skeleton = ([], data) if individual else self._split(data)
+        skeleton_digest = _digest(skeleton)
+        loaded = None
+        restart = False
+        if skeleton_digest != self._skeleton_digest:
+            # Competition details and rankings; small whatever the progress
+            loaded = self._load_skeleton(skeleton)
+            extractor = loaded[0]
+            # Names and nations feed every row, so a changed team list
+            # means rebuilding every match
+            restart = (extractor.team_dict, extractor.fencer_dict) != (
+                self.extractor.team_dict, self.extractor.fencer_dict)
+
+        updates = []
+        seen = set()
+        # Unchanged matches normally keep their relative order; if the file
+        # moved any, the ordered key lists are rebuilt once below
+        reordered = False
+        previous_position = -1
+        for position, (key, span, stage, tableau) in enumerate(matches):
+            seen.add(key)
+            digest = _digest(span)
+            state = self.matches.get(key)
+            if state is not None and state["digest"] == digest and not restart:
+                reordered = reordered or state["position"] < previous_position
+                previous_position = state["position"]
+                state["position"] = position
+                continue
+            updates.append((key, parse_match(span, stage, tableau), digest, position))
+
+        if loaded is not None:
+            self.extractor, self.base = loaded
+            self._skeleton_digest = skeleton_digest
+        counts = Counter()
+        dirty = set()
+        known = set(self.matches)
+        if restart:
+            for key in list(self.matches):
+                state = self.matches[key]
+                dirty.update((nation, state["stage"]) for nation in state["nations"])
+                self._remove_match(key)
+        # Every removal comes before the first addition, so the ordered key
+        # lists only hold matches with up-to-date positions when inserting
+        updated = {key for key, _, _, _ in updates}
+        for key in [key for key in self.matches if key not in seen or key in updated]:
+            state = self.matches[key]
+            dirty.update((nation, state["stage"]) for nation in state["nations"])
+            self._remove_match(key)
+        for key, match, digest, position in updates:
+            counts["changed" if key in known else "added"] += 1
+            state = self._add_match(key, match, digest, position)
+            dirty.update((nation, match["stage"]) for nation in state["nations"])
+        if reordered:
+            self._sort_orders()
+            dirty.update((nation, stage) for nation, stages in self.stage_matches.items() for stage in stages)
+
+        for nation, stage in dirty:
+            self.stage_tables[nation].pop(stage, None)
+        return {"added": counts["added"], "changed": counts["changed"], "removed": len(known - seen),
+                "matches": len(self.matches)}
+
+    def _add_match(self, key, match, digest, position):
+        extractor = self.extractor
+        nations = extractor.match_nations(match["teams"])
+        team_d = extractor.team_dict.get(match["teams"].get("D"))
+        team_g = extractor.team_dict.get(match["teams"].get("G"))
+        team_d_name = team_d["Team Name"] if team_d else "Unknown Team"
+        team_g_name = team_g["Team Name"] if team_g else "Unknown Team"
+
+        rows = []
+        fencer_bouts = []  # (nation, fencer, scored, conceded, opponent team, outcome), in leg order
+        legs = iter_relay_legs(match["bouts"])
+        for leg, (ref_d, score_d, touches_d, ref_g, score_g, touches_g) in enumerate(legs):
+            diff_in_touches = touches_d - touches_g
+            fencer_d = extractor.fencer_dict.get(ref_d, UNKNOWN_FENCER)
+            fencer_g = extractor.fencer_dict.get(ref_g, UNKNOWN_FENCER)
+            if fencer_d["Nation"] in nations:
+                fencer_bouts.append((fencer_d["Nation"], fencer_d["Name"], touches_d, touches_g,
+                                     team_g_name, bout_outcome(touches_d, touches_g)))
+            if fencer_g["Nation"] in nations:
+                fencer_bouts.append((fencer_g["Nation"], fencer_g["Name"], touches_g, touches_d,
+                                     team_d_name, bout_outcome(touches_g, touches_d)))
+            # In STAGE_COLUMNS order
+            rows.append((
+                team_d_name,
+                fencer_d["Name"],
+                f"{touches_d} ({diff_in_touches})",
+                score_d,
+                score_g,
+                f"{touches_g} ({-diff_in_touches})",
+                fencer_g["Name"],
+                team_g_name,
+            ))
+
+        state = {
+            "digest": digest,
+            "position": position,
+            "stage": match["stage"],
+            "ref": (match["stage"], match["tableau"], match["attrib"].get("ID")),
+            "nations": nations,
+            "rows": rows,
+            "fencer_bouts": fencer_bouts,
+        }
+        self.matches[key] = state
+        for nation in nations:
+            self.nation_refs[nation].insert(self._insert(self.nation_matches[nation], key), state["ref"])
+            self._insert(self.stage_matches[nation][match["stage"]], key)
+        for nation, fencer, scored, conceded, opponent, outcome in fencer_bouts:
+            totals = self.touches[nation].get(fencer)
+            if totals is None:
+                totals = {"scored": 0, "against": 0, "outcomes": Counter(), "bouts": 0, "table": None}
+                self.touches[nation][fencer] = totals
+            totals["scored"] += scored
+            totals["against"] += conceded
+            totals["outcomes"][(opponent, outcome)] += 1
+            totals["bouts"] += 1
+            totals["table"] = None
+        return state
+
+    def _remove_match(self, key):
+        state = self.matches.pop(key)
+        for nation in state["nations"]:
+            index = self.nation_matches[nation].index(key)
+            del self.nation_matches[nation][index]
+            del self.nation_refs[nation][index]
+            self.stage_matches[nation][state["stage"]].remove(key)
+        for nation, fencer, scored, conceded, opponent, outcome in state["fencer_bouts"]:
+            totals = self.touches[nation].get(fencer)
+            if totals is None:
+                continue
+            totals["scored"] -= scored
+            totals["against"] -= conceded
+            totals["outcomes"][(opponent, outcome)] -= 1
+            totals["bouts"] -= 1
+            totals["table"] = None
+            if not totals["bouts"]:
+                del self.touches[nation][fencer]
+
+    # -- document order ------------------------------------------------------
+    def _position(self, key):
+        return self.matches[key]["position"]
+
+    def _insert(self, keys, key):
+        index = bisect.bisect_right(keys, self._position(key), key=self._position)
+        keys.insert(index, key)
+        return index
+
+    def _sort_orders(self):
+        for nation, keys in self.nation_matches.items():
+            keys.sort(key=self._position)
+            self.nation_refs[nation] = [self.matches[key]["ref"] for key in keys]
+        for stages in self.stage_matches.values():
+            for keys in stages.values():
+                keys.sort(key=self._position)
+
+    def _stage_table(self, nation, stage):
+        table = self.stage_tables[nation].get(stage)
+        if table is None:
+            rows = [row for key in self.stage_matches[nation][stage] for row in self.matches[key]["rows"]]
+            table = pd.DataFrame(rows, columns=STAGE_COLUMNS)
+            self.stage_tables[nation][stage] = table
+        return table
+
+    # -- report structures ---------------------------------------------------
+    def competition(self):
+        """The extract_competition-shaped dict, or None before a first load."""
+        if self.base is None:
+            return None
+        if self.base["kind"] == "individual":
+            return self.base
+        if self._competition is None or self._competition[0] != self.revision:
+            nations = {}
+            for nation, index in self.extractor.nation_index.items():
+                nations[nation] = dict(index, matches=list(self.nation_refs.get(nation, ())))
+            self._competition = (self.revision, dict(self.base, nations=nations))
+        return self._competition[1]
+
+    def _fencer_order(self, nation):
+        # Fencers by their first bout: walks the nation's matches in order
+        # only until every fencer has been seen, usually the first few
+        remaining = set(self.touches[nation])
+        order = []
+        for key in self.nation_matches.get(nation, ()):
+            if not remaining:
+                break
+            for bout_nation, fencer, *_ in self.matches[key]["fencer_bouts"]:
+                if bout_nation == nation and fencer in remaining:
+                    remaining.discard(fencer)
+                    order.append(fencer)
+        return order
+
+    def summary(self, nation):
+        """The summarise_competition-shaped dict for one nation."""
+        if self.base["kind"] == "individual":
+            return summarise_competition(self.base, nation)
+        # Stages by their first match; each stage's keys are in document order
+        stages = sorted(
+            (stage for stage, keys in self.stage_matches[nation].items() if keys),
+            key=lambda stage: self._position(self.stage_matches[nation][stage][0]),
+        )
+        nation_summary = []
+        for fencer in self._fencer_order(nation):
+            totals = self.touches[nation][fencer]
+            if totals["table"] is None:
+                totals["table"] = _outcome_table(totals["outcomes"])
+            nation_summary.append({
+                "Fencer": fencer,
+                "Scored": totals["scored"],
+                "Conceded": totals["against"],
+                "Total": totals["scored"] - totals["against"],
+                "Outcomes": totals["table"],
+            })
+        view = self.extractor.nation_index.get(nation, {"fencers": []})
+        num_teams, num_countries, team_count_df = get_country_team_counts(self.base["team_dict"])
+        return {
+            "nation": nation,
+            "kind": "team",
+            "tables_data": {stage: self._stage_table(nation, stage) for stage in stages},
+            "nation_summary": nation_summary,
+            "nation_fencers_df": get_nation_fencers_table(self.base["fencer_dict"], view["fencers"])[["Name", "Date of Birth"]],
+            "num_teams": num_teams,
+            "num_countries": num_countries,
+            "team_count_df": team_count_df,
+            "poule_indicators": EMPTY_INDICATORS,
+        }
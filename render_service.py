@@ -0,0 +1,245 @@
+"""Local HTTP service that renders Word reports for uploaded results files.
+
+    python render_service.py --port 8765 --workers 4
+
+POST the raw XML to /render, optionally with ?nation=QAT and
+?sections=overview,tables (any of extraction.REPORT_SECTIONS), and the
+.docx comes back. Renders run in a bounded process pool. Identical
+requests (same file content, nation and sections) that arrive while one is
+rendering wait for that render instead of starting their own, and finished
+reports are kept in an LRU cache on the same key. The X-Report-Source
+response header says which of "cache", "shared" or "render" served a
+request. GET /health returns counters as JSON.
+
+Set REPORT_SERVICE_URL (e.g. http://127.0.0.1:8765) for the Streamlit app
+to build its Word documents here.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from extraction import DEFAULT_NATION, REPORT_SECTIONS, build_overview_data, summarise_competition
+from report_cache import LRUCache, file_digest
+from snapshot import SNAPSHOT_DIR, load_or_extract
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_ENTRIES = 64
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+SERVICE_URL = os.environ.get("REPORT_SERVICE_URL")
+
+
+class RenderError(Exception):
+    """The file could not be rendered; the message is shown to the client."""
+
+
+def parse_sections(value):
+    # "tables,review" -> ("tables", "review") in document order
+    if not value:
+        return REPORT_SECTIONS
+    requested = {section.strip() for section in value.split(",") if section.strip()}
+    unknown = requested.difference(REPORT_SECTIONS)
+    if unknown:
+        raise RenderError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    return tuple(section for section in REPORT_SECTIONS if section in requested)
+
+
+# ---------------------------
+# Pool Worker
+# ---------------------------
+def render_docx(xml_bytes, file_hash, nation, sections, snapshot_dir):
+    # Runs in a worker process; parse errors come back as RenderError.
+    # python-docx is only loaded here, so the client half stays light.
+    from word_export import export_competition_report
+
+    try:
+        competition = load_or_extract(xml_bytes, file_hash, snapshot_dir=snapshot_dir)
+    except UnicodeDecodeError:
+        raise RenderError("Encoding issue: Ensure the file is saved as UTF-8.") from None
+    except ET.ParseError as e:
+        raise RenderError(f"XML Parsing Error: {e}") from None
+    summary = summarise_competition(competition, nation)
+    overview_data = build_overview_data(competition["info"], summary["num_teams"], summary["num_countries"])
+    return export_competition_report(competition, summary, overview_data, sections=sections).getvalue()
+
+
+# ---------------------------
+# Coalescing Renderer
+# ---------------------------
+class ReportRenderer:
+    """Process-pool renders shared between identical concurrent requests."""
+
+    def __init__(self, workers=None, cache_entries=DEFAULT_CACHE_ENTRIES, snapshot_dir=SNAPSHOT_DIR):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.cache = LRUCache(cache_entries)
+        self.snapshot_dir = snapshot_dir
+        self.counts = Counter()
+        self._in_flight = {}
+        # Reentrant: a render that is already done runs _finish straight
+        # from add_done_callback, inside render's locked block
+        self._lock = threading.RLock()
+
+    def render(self, xml_bytes, nation=DEFAULT_NATION, sections=REPORT_SECTIONS):
+        """Returns (docx bytes, source); raises RenderError for bad files."""
+        file_hash = file_digest(xml_bytes)
+        key = (file_hash, nation, tuple(sections))
+        with self._lock:
+            docx = self.cache.get(key)
+            if docx is not None:
+                source = "cache"
+            elif key in self._in_flight:
+                future = self._in_flight[key]
+                source = "shared"
+            else:
+                future = self.pool.submit(render_docx, xml_bytes, file_hash, nation, tuple(sections), self.snapshot_dir)
+                self._in_flight[key] = future
+                future.add_done_callback(lambda done: self._finish(key, done))
+                source = "render"
+            self.counts[source] += 1
+        if docx is None:
+            docx = future.result()
+        return docx, source
+
+    def _finish(self, key, future):
+        # Cached before leaving _in_flight, so a request never misses both
+        with self._lock:
+            if not future.cancelled() and future.exception() is None:
+                self.cache.put(key, future.result())
+            else:
+                self.counts["failed"] += 1
+            del self._in_flight[key]
+
+    def stats(self):
+        with self._lock:
+            return {**self.counts, "in_flight": len(self._in_flight), "cache": self.cache.stats()}
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# ---------------------------
+# HTTP Interface
+# ---------------------------
+class RenderHandler(BaseHTTPRequestHandler):
+    renderer = None  # Set by make_server
+    max_upload_bytes = MAX_UPLOAD_BYTES
+
+    def _reply(self, status, body, content_type="text/plain; charset=utf-8", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path != "/health":
+            self._reply(404, b"Not found")
+            return
+        self._reply(200, json.dumps(self.renderer.stats()).encode(), "application/json")
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/render":
+            self._reply(404, b"Not found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._reply(400, b"Invalid Content-Length")
+            return
+        if length > self.max_upload_bytes:
+            self._reply(413, f"Results files are limited to {self.max_upload_bytes} bytes".encode())
+            return
+        if length <= 0:
+            self._reply(400, b"Send the results XML as the request body")
+            return
+        xml_bytes = self.rfile.read(length)
+        query = urllib.parse.parse_qs(url.query)
+        nation = query.get("nation", [DEFAULT_NATION])[0].upper()
+        try:
+            sections = parse_sections(query.get("sections", [""])[0])
+            docx, source = self.renderer.render(xml_bytes, nation, sections)
+        except RenderError as e:
+            self._reply(400, str(e).encode())
+            return
+        except Exception as e:
+            self._reply(500, f"{type(e).__name__}: {e}".encode())
+            return
+        self._reply(200, docx, DOCX_MIME, {"X-Report-Source": source})
+
+    def log_message(self, format, *args):
+        pass  # One line per request drowns out everything else under load
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, workers=None, cache_entries=DEFAULT_CACHE_ENTRIES,
+                snapshot_dir=SNAPSHOT_DIR, max_upload_bytes=MAX_UPLOAD_BYTES):
+    renderer = ReportRenderer(workers, cache_entries, snapshot_dir)
+    handler = type("BoundRenderHandler", (RenderHandler,),
+                   {"renderer": renderer, "max_upload_bytes": max_upload_bytes})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, renderer
+
+
+# ---------------------------
+# Client
+# ---------------------------
+def request_report(xml_bytes, nation=DEFAULT_NATION, sections=REPORT_SECTIONS, url=SERVICE_URL, timeout=600):
+    """Ask a running service for a report; returns the .docx bytes.
+
+    Raises RenderError with the service's message for files it rejects,
+    and OSError (urllib.error.URLError) if it cannot be reached.
+    """
+    query = urllib.parse.urlencode({"nation": nation, "sections": ",".join(sections)})
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/render?{query}", data=xml_bytes, headers={"Content-Type": "application/xml"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 400:
+            raise RenderError(e.read().decode(errors="replace")) from None
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Word reports for Ophardt results files over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="render processes (default: CPU count)")
+    parser.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help=f"finished reports kept in memory (default: {DEFAULT_CACHE_ENTRIES})")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR,
+                        help=f"where parsed competitions are stored for reuse (default: {SNAPSHOT_DIR})")
+    parser.add_argument("--max-upload-mb", type=float, default=MAX_UPLOAD_BYTES / 2**20,
+                        help=f"largest results file accepted (default: {MAX_UPLOAD_BYTES // 2**20})")
+    args = parser.parse_args(argv)
+
+    server, renderer = make_server(args.host, args.port, args.workers, args.cache_entries, args.snapshot_dir,
+                                   int(args.max_upload_mb * 2**20))
+    print(f"Serving reports on http://{args.host}:{server.server_port} with {args.workers} workers", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        renderer.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 32
+# Parsed competitions and reports are large, so the cache is bounded by
+# their approximate size as well as their number
+DEFAULT_MAX_BYTES = int(float(os.environ.get("REPORT_CACHE_MAX_MB", "512")) * 2**20)
+FRAME_CELL_BYTES = 50
+
+
+# ---------------------------
+# Content-Hash Keyed LRU Cache
+# ---------------------------
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def approximate_size(value):
+    # Bytes held by a cached value: buffers by length, frames by cell count,
+    # containers by their contents, anything else by its own size
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, "memory_usage"):  # DataFrame or Series, without importing pandas
+        # memory_usage(deep=True) over a summary's many stage frames costs
+        # more than building them; report tables average about this per cell
+        return value.size * FRAME_CELL_BYTES
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters.
+
+    Entries are evicted oldest first while there are more than max_entries
+    or their sizes total more than max_bytes; the newest entry is always
+    kept. A put() without a size charges approximate_size(value).
+
+    Values are computed outside the lock, so two sessions missing on the
+    same key at once may both compute it; the last one stored wins.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=None):
+        if size is None:
+            size = approximate_size(value)
+        with self._lock:
+            self._bytes += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+
+    def get_or_compute(self, key, compute, size=None):
+        # None is never cached so failed parses are retried on the next run
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            if value is not None:
+                self.put(key, value, size)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Shared by every session of the Streamlit process; imported modules are not
+# re-executed on reruns, so entries survive widget interactions.
+report_cache = LRUCache()
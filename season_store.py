@@ -0,0 +1,429 @@
+"""Season-wide statistics in a local SQLite database.
+
+Each competition is ingested once: its teams, fencers, final rankings and
+every relay leg are written to indexed tables, replacing any earlier
+ingestion of the same competition ID. Career and season queries then run
+against the database instead of re-parsing XML.
+
+Head-to-head totals (fencer against fencer, nation against nation) are
+kept in their own tables, one row per ordered pair. Ingesting a
+competition adds its bouts to them and re-ingesting subtracts the old
+ones first, so head-to-head queries read one indexed row per opponent
+however many competitions are stored.
+
+    python season_store.py ingest results/ "archive/*.xml" --db season.sqlite
+    python season_store.py stats --nation QAT
+    python season_store.py h2h --fencer 101 --opponent 205
+    python season_store.py h2h --nation QAT --opponent-nation ITA
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+from extraction import CompetitionExtractor, build_overview_data, bout_outcome, iter_relay_legs
+from report_cache import file_digest
+from xml_loader import iter_competition
+
+DEFAULT_DB_PATH = os.environ.get("SEASON_DB", "season.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS competitions (
+    competition_id TEXT PRIMARY KEY,
+    title TEXT, season TEXT, date TEXT, location TEXT, championship TEXT,
+    category TEXT, weapon TEXT, gender TEXT, file_hash TEXT, ingested_at REAL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    competition_id TEXT, team_id TEXT, team_name TEXT, nation TEXT, final_rank INTEGER,
+    PRIMARY KEY (competition_id, team_id)
+);
+CREATE TABLE IF NOT EXISTS fencers (
+    competition_id TEXT, fencer_id TEXT, name TEXT, date_of_birth TEXT,
+    lateralite TEXT, team_id TEXT, nation TEXT,
+    PRIMARY KEY (competition_id, fencer_id)
+);
+-- One row per fencer per relay leg, seen from that fencer's side
+CREATE TABLE IF NOT EXISTS fencer_bouts (
+    competition_id TEXT, stage TEXT, tableau TEXT, match_id TEXT, leg INTEGER,
+    fencer_id TEXT, nation TEXT, team_id TEXT,
+    opponent_id TEXT, opponent_nation TEXT, opponent_team_id TEXT,
+    scored INTEGER, conceded INTEGER, outcome TEXT
+);
+-- Running totals over fencer_bouts per ordered pair, kept in step on ingest
+CREATE TABLE IF NOT EXISTS fencer_h2h (
+    fencer_id TEXT, opponent_id TEXT, competitions INTEGER, bouts INTEGER,
+    scored INTEGER, conceded INTEGER, victories INTEGER, defeats INTEGER, draws INTEGER,
+    PRIMARY KEY (fencer_id, opponent_id)
+);
+CREATE TABLE IF NOT EXISTS nation_h2h (
+    nation TEXT, opponent_nation TEXT, competitions INTEGER, bouts INTEGER,
+    scored INTEGER, conceded INTEGER, victories INTEGER, defeats INTEGER, draws INTEGER,
+    PRIMARY KEY (nation, opponent_nation)
+);
+CREATE INDEX IF NOT EXISTS idx_teams_nation ON teams (nation);
+CREATE INDEX IF NOT EXISTS idx_fencers_fencer ON fencers (fencer_id);
+CREATE INDEX IF NOT EXISTS idx_fencers_nation ON fencers (nation);
+CREATE INDEX IF NOT EXISTS idx_bouts_fencer ON fencer_bouts (fencer_id, opponent_nation);
+CREATE INDEX IF NOT EXISTS idx_bouts_nation ON fencer_bouts (nation, opponent_nation);
+CREATE INDEX IF NOT EXISTS idx_bouts_competition ON fencer_bouts (competition_id, stage);
+"""
+
+COMPETITION_TABLES = ("competitions", "teams", "fencers", "fencer_bouts")
+# Head-to-head table -> its pair columns in fencer_bouts
+H2H_TABLES = {
+    "fencer_h2h": ("fencer_id", "opponent_id"),
+    "nation_h2h": ("nation", "opponent_nation"),
+}
+H2H_TOTALS = ("competitions", "bouts", "scored", "conceded", "victories", "defeats", "draws")
+
+
+# ---------------------------
+# Connection and Ingestion
+# ---------------------------
+def connect(db_path=DEFAULT_DB_PATH, check_same_thread=True):
+    # check_same_thread=False lets a connection kept across the app's reruns,
+    # which may run on different threads, be used by each in turn
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn.executescript(SCHEMA)
+    # Stores written before the head-to-head tables existed get them filled once
+    if (conn.execute("SELECT EXISTS (SELECT 1 FROM fencer_bouts)").fetchone()[0]
+            and not conn.execute("SELECT EXISTS (SELECT 1 FROM fencer_h2h)").fetchone()[0]):
+        rebuild_head_to_head(conn)
+    return conn
+
+
+def _apply_h2h(conn, competition_id, sign):
+    # Adds (sign=1) or subtracts (sign=-1) one competition's stored bouts
+    if sign < 0 and not conn.execute(
+        "SELECT EXISTS (SELECT 1 FROM fencer_bouts WHERE competition_id = ?)", (competition_id,)
+    ).fetchone()[0]:
+        return
+    for table, (side, other) in H2H_TABLES.items():
+        conn.execute(
+            f"""
+            INSERT INTO {table} ({side}, {other}, {", ".join(H2H_TOTALS)})
+            SELECT {side}, {other}, ?, ? * COUNT(*), ? * SUM(scored), ? * SUM(conceded),
+                   ? * SUM(outcome = 'Victory'), ? * SUM(outcome = 'Defeat'), ? * SUM(outcome = 'Draw')
+            FROM fencer_bouts WHERE competition_id = ?
+            GROUP BY {side}, {other}
+            ON CONFLICT ({side}, {other}) DO UPDATE SET
+            {", ".join(f"{column} = {column} + excluded.{column}" for column in H2H_TOTALS)}
+            """,
+            (sign,) * len(H2H_TOTALS) + (competition_id,),
+        )
+        if sign < 0:
+            conn.execute(f"DELETE FROM {table} WHERE bouts <= 0")
+
+
+def rebuild_head_to_head(conn):
+    """Recompute the head-to-head tables from every stored bout."""
+    with conn:
+        for table, (side, other) in H2H_TABLES.items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(
+                f"""
+                INSERT INTO {table} ({side}, {other}, {", ".join(H2H_TOTALS)})
+                SELECT {side}, {other}, COUNT(DISTINCT competition_id), COUNT(*), SUM(scored), SUM(conceded),
+                       SUM(outcome = 'Victory'), SUM(outcome = 'Defeat'), SUM(outcome = 'Draw')
+                FROM fencer_bouts
+                GROUP BY {side}, {other}
+                """
+            )
+
+
+def _bout_rows(competition_id, match, team_dict, fencer_dict):
+    team_refs = match["teams"]
+    nations = {
+        side: team_dict.get(team_refs.get(side), {}).get("Nation", "Unknown")
+        for side in ("D", "G")
+    }
+    match_id = match["attrib"].get("ID")
+    rows = []
+    legs = iter_relay_legs(match["bouts"])
+    for leg, (ref_d, _, touches_d, ref_g, _, touches_g) in enumerate(legs, start=1):
+        nation_d = fencer_dict.get(ref_d, {}).get("Nation", nations["D"])
+        nation_g = fencer_dict.get(ref_g, {}).get("Nation", nations["G"])
+        common = (competition_id, match["stage"], match["tableau"], match_id, leg)
+        rows.append(common + (ref_d, nation_d, team_refs.get("D"), ref_g, nation_g, team_refs.get("G"),
+                              touches_d, touches_g, bout_outcome(touches_d, touches_g)))
+        rows.append(common + (ref_g, nation_g, team_refs.get("G"), ref_d, nation_d, team_refs.get("D"),
+                              touches_g, touches_d, bout_outcome(touches_g, touches_d)))
+    return rows
+
+
+def ingest_competition(conn, source, file_hash=None):
+    """Load one results file (path or binary file); returns its competition ID.
+
+    Re-ingesting a competition ID replaces everything stored for it.
+    """
+    extractor = CompetitionExtractor()
+    matches = []
+    for kind, data in iter_competition(source):
+        if kind == "match":
+            matches.append(data)
+        else:
+            extractor.add(kind, data)
+    if extractor.kind == "individual":
+        raise ValueError("The season store holds team competitions only")
+    info = extractor.info
+    competition_id = info.get("ID") or file_hash
+    if not competition_id:
+        raise ValueError("Competition has no ID attribute and no file hash was given")
+
+    team_dict, fencer_dict = extractor.team_dict, extractor.fencer_dict
+    ranks = {team_id: rank for team_id, rank in extractor.ranking_refs}
+    overview = build_overview_data(info, len(team_dict), None)
+    bout_rows = []
+    for match in matches:
+        bout_rows.extend(_bout_rows(competition_id, match, team_dict, fencer_dict))
+
+    with conn:
+        _apply_h2h(conn, competition_id, -1)
+        for table in COMPETITION_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE competition_id = ?", (competition_id,))
+        conn.execute(
+            "INSERT INTO competitions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (competition_id, overview["Tournament"], overview["Year"], overview["Date"], overview["Location"],
+             overview["Championship"], overview["Category"], overview["Weapon"], overview["Gender"],
+             file_hash, time.time()),
+        )
+        conn.executemany(
+            "INSERT INTO teams VALUES (?, ?, ?, ?, ?)",
+            [(competition_id, team_id, team["Team Name"], team["Nation"], ranks.get(team_id))
+             for team_id, team in team_dict.items()],
+        )
+        conn.executemany(
+            "INSERT INTO fencers VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(competition_id, fencer_id, fencer["Name"], fencer["Date of Birth"], fencer["Lateralite"],
+              fencer["EquipeID"], fencer["Nation"])
+             for fencer_id, fencer in fencer_dict.items()],
+        )
+        conn.executemany(
+            "INSERT INTO fencer_bouts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", bout_rows
+        )
+        _apply_h2h(conn, competition_id, 1)
+    return competition_id
+
+
+def ingest_file(conn, path):
+    with open(path, "rb") as handle:
+        file_hash = file_digest(handle.read())
+    return ingest_competition(conn, path, file_hash=file_hash)
+
+
+# ---------------------------
+# Season Queries
+# ---------------------------
+def list_competitions(conn):
+    return pd.read_sql_query(
+        "SELECT competition_id, title, season, date, location FROM competitions ORDER BY ingested_at",
+        conn,
+    )
+
+
+def list_nations(conn):
+    return [row[0] for row in conn.execute("SELECT DISTINCT nation FROM fencers ORDER BY nation")]
+
+
+def _season_filter(season):
+    if season is None:
+        return "", ()
+    return " AND b.competition_id IN (SELECT competition_id FROM competitions WHERE season = ?)", (season,)
+
+
+def fencer_career_stats(conn, nation, season=None):
+    """Touches and outcomes per fencer of a nation across stored competitions."""
+    season_sql, season_args = _season_filter(season)
+    return pd.read_sql_query(
+        f"""
+        SELECT b.fencer_id AS "Fencer ID",
+               (SELECT name FROM fencers f WHERE f.fencer_id = b.fencer_id LIMIT 1) AS "Name",
+               COUNT(DISTINCT b.competition_id) AS "Competitions",
+               COUNT(*) AS "Bouts",
+               SUM(b.scored) AS "Scored",
+               SUM(b.conceded) AS "Conceded",
+               SUM(b.scored) - SUM(b.conceded) AS "Total",
+               SUM(b.outcome = 'Victory') AS "Victory",
+               SUM(b.outcome = 'Defeat') AS "Defeat",
+               SUM(b.outcome = 'Draw') AS "Draw",
+               ROUND(100.0 * SUM(b.outcome = 'Victory') / COUNT(*), 1) AS "Win %"
+        FROM fencer_bouts b
+        WHERE b.nation = ?{season_sql}
+        GROUP BY b.fencer_id
+        ORDER BY "Total" DESC
+        """,
+        conn,
+        params=(nation,) + season_args,
+    )
+
+
+def win_rate_by_opponent_nation(conn, fencer_id=None, nation=None, season=None):
+    """Outcomes against each opposing nation, for one fencer or a whole nation."""
+    if fencer_id is not None:
+        where, args = "b.fencer_id = ?", (fencer_id,)
+    elif nation is not None:
+        where, args = "b.nation = ?", (nation,)
+    else:
+        raise ValueError("Give a fencer_id or a nation")
+    season_sql, season_args = _season_filter(season)
+    return pd.read_sql_query(
+        f"""
+        SELECT b.opponent_nation AS "Opponent Nation",
+               COUNT(*) AS "Bouts",
+               SUM(b.scored) AS "Scored",
+               SUM(b.conceded) AS "Conceded",
+               SUM(b.outcome = 'Victory') AS "Victory",
+               SUM(b.outcome = 'Defeat') AS "Defeat",
+               SUM(b.outcome = 'Draw') AS "Draw",
+               ROUND(100.0 * SUM(b.outcome = 'Victory') / COUNT(*), 1) AS "Win %"
+        FROM fencer_bouts b
+        WHERE {where}{season_sql}
+        GROUP BY b.opponent_nation
+        ORDER BY "Bouts" DESC
+        """,
+        conn,
+        params=args + season_args,
+    )
+
+
+def nation_results(conn, nation):
+    # Final rank of each of the nation's teams per competition
+    return pd.read_sql_query(
+        """
+        SELECT c.season AS "Season", c.date AS "Date", c.title AS "Competition",
+               t.team_name AS "Team Name", t.final_rank AS "Final Rank"
+        FROM teams t JOIN competitions c ON c.competition_id = t.competition_id
+        WHERE t.nation = ?
+        ORDER BY c.ingested_at, t.final_rank
+        """,
+        conn,
+        params=(nation,),
+    )
+
+
+# ---------------------------
+# Head-to-Head Queries
+# ---------------------------
+H2H_COLUMNS = """
+       h.competitions AS "Competitions",
+       h.bouts AS "Bouts",
+       h.scored AS "Scored",
+       h.conceded AS "Conceded",
+       h.scored - h.conceded AS "Total",
+       h.victories AS "Victory",
+       h.defeats AS "Defeat",
+       h.draws AS "Draw",
+       ROUND(100.0 * h.victories / h.bouts, 1) AS "Win %"
+"""
+
+
+def fencer_head_to_head(conn, fencer_id, opponent_id=None):
+    """A fencer's totals against every opponent met, or against one."""
+    opponent_sql, opponent_args = ("", ()) if opponent_id is None else (" AND h.opponent_id = ?", (opponent_id,))
+    return pd.read_sql_query(
+        f"""
+        SELECT h.opponent_id AS "Opponent ID",
+               (SELECT name FROM fencers f WHERE f.fencer_id = h.opponent_id LIMIT 1) AS "Opponent",
+               (SELECT nation FROM fencers f WHERE f.fencer_id = h.opponent_id LIMIT 1) AS "Nation",{H2H_COLUMNS}
+        FROM fencer_h2h h
+        WHERE h.fencer_id = ?{opponent_sql}
+        ORDER BY "Bouts" DESC, "Opponent ID"
+        """,
+        conn,
+        params=(fencer_id,) + opponent_args,
+    )
+
+
+def nation_head_to_head(conn, nation, opponent_nation=None):
+    """A nation's fencers' totals against every opposing nation, or against one."""
+    opponent_sql, opponent_args = ("", ()) if opponent_nation is None else (" AND h.opponent_nation = ?", (opponent_nation,))
+    return pd.read_sql_query(
+        f"""
+        SELECT h.opponent_nation AS "Opponent Nation",{H2H_COLUMNS}
+        FROM nation_h2h h
+        WHERE h.nation = ?{opponent_sql}
+        ORDER BY "Bouts" DESC, "Opponent Nation"
+        """,
+        conn,
+        params=(nation,) + opponent_args,
+    )
+
+
+def pair_bouts(conn, fencer_id, opponent_id):
+    # Every stored bout between two fencers, from the first one's side
+    return pd.read_sql_query(
+        """
+        SELECT c.season AS "Season", c.date AS "Date", c.title AS "Competition",
+               b.stage AS "Stage", b.tableau AS "Tableau", b.leg AS "Leg",
+               b.scored AS "Scored", b.conceded AS "Conceded", b.outcome AS "Outcome"
+        FROM fencer_bouts b JOIN competitions c ON c.competition_id = b.competition_id
+        WHERE b.fencer_id = ? AND b.opponent_id = ?
+        ORDER BY c.ingested_at, b.match_id, b.leg
+        """,
+        conn,
+        params=(fencer_id, opponent_id),
+    )
+
+
+def main(argv=None):
+    from batch_report import find_xml_files
+
+    parser = argparse.ArgumentParser(description="Season statistics store for competition XML files.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"SQLite database path (default: {DEFAULT_DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="load competition XML files into the store")
+    ingest.add_argument("inputs", nargs="+", help="directories of .xml files or glob patterns")
+    stats = commands.add_parser("stats", help="print career statistics for a nation")
+    stats.add_argument("--nation", required=True)
+    stats.add_argument("--season", help="restrict to one season, e.g. 2024/2025")
+    h2h = commands.add_parser("h2h", help="print head-to-head records of a fencer or a nation")
+    subject = h2h.add_mutually_exclusive_group(required=True)
+    subject.add_argument("--fencer", help="fencer ID")
+    subject.add_argument("--nation")
+    h2h.add_argument("--opponent", help="opposing fencer ID, with --fencer; also lists their bouts")
+    h2h.add_argument("--opponent-nation", help="opposing nation, with --nation")
+    h2h.add_argument("--rebuild", action="store_true", help="recompute the head-to-head tables first")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    if args.command == "ingest":
+        failures = 0
+        for path in find_xml_files(args.inputs):
+            started = time.perf_counter()
+            try:
+                competition_id = ingest_file(conn, path)
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {os.path.basename(path)}: {type(e).__name__}: {e}")
+                continue
+            print(f"ok     {os.path.basename(path)}: competition {competition_id} "
+                  f"in {time.perf_counter() - started:.2f}s")
+        return 1 if failures else 0
+
+    if args.command == "h2h":
+        if args.rebuild:
+            rebuild_head_to_head(conn)
+        with pd.option_context("display.width", 200, "display.max_columns", 20):
+            if args.fencer is not None:
+                print(fencer_head_to_head(conn, args.fencer, args.opponent).to_string(index=False))
+                if args.opponent is not None:
+                    print()
+                    print(pair_bouts(conn, args.fencer, args.opponent).to_string(index=False))
+            else:
+                opponent_nation = args.opponent_nation.upper() if args.opponent_nation else None
+                print(nation_head_to_head(conn, args.nation.upper(), opponent_nation).to_string(index=False))
+        return 0
+
+    nation = args.nation.upper()
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(fencer_career_stats(conn, nation, args.season).to_string(index=False))
+        print()
+        print(win_rate_by_opponent_nation(conn, nation=nation, season=args.season).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Columnar on-disk snapshots of extracted competitions.
+
+A snapshot holds everything extract_competition returns for one results
+file, so reopening the file skips XML parsing and extraction. Each one is a
+directory named after the file's SHA-256 and PARSER_VERSION, holding Arrow
+IPC files (one per table, strings dictionary-encoded) and a JSON file for
+the competition attributes and per-nation lists. Tables are read through a
+memory map, so numeric columns are used in place rather than copied. The
+directory is kept under SNAPSHOT_MAX_BYTES by prune_snapshots().
+
+    python snapshot.py results/*.xml    # build snapshots ahead of time
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from extraction import (
+    EMPTY_INDICATORS,
+    EMPTY_OUTCOMES,
+    EMPTY_STAGE_ROWS,
+    EMPTY_TOTALS,
+    PARSER_VERSION,
+    extract_competition,
+)
+from report_cache import file_digest
+from timing import NULL_TIMER
+
+SNAPSHOT_DIR = os.environ.get("REPORT_SNAPSHOT_DIR", "snapshots")
+# Every distinct results file opened adds a snapshot (a few times the XML's
+# size), so after each save the directory is pruned: snapshots of other
+# PARSER_VERSIONs go, then the least recently used until the rest fit in
+# REPORT_SNAPSHOT_MAX_MB (0 keeps everything of the current version)
+SNAPSHOT_MAX_BYTES = int(float(os.environ.get("REPORT_SNAPSHOT_MAX_MB", "1024")) * 2**20)
+
+# Per-nation frames, stored back to back with each nation's row count
+NATION_FRAMES = {
+    "stage_rows": EMPTY_STAGE_ROWS,
+    "fencer_totals": EMPTY_TOTALS,
+    "fencer_outcomes": EMPTY_OUTCOMES,
+    "poule_indicators": EMPTY_INDICATORS,
+}
+META_FILE = "competition.json"
+
+
+def snapshot_path(file_hash, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"{file_hash}-p{PARSER_VERSION}")
+
+
+# ---------------------------
+# Arrow Conversion
+# ---------------------------
+def _to_table(df):
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if values.dtype.kind in "iubf":
+            columns[name] = pa.array(values.to_numpy())
+        else:
+            # Names, teams and stages repeat on almost every row
+            columns[name] = pa.array(values.to_numpy(dtype=object), type=pa.string()).dictionary_encode()
+    return pa.table(columns) if columns else pa.table({})
+
+
+def _column_values(column):
+    array = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+    if pa.types.is_dictionary(array.type):
+        # Decode to the object columns extraction builds: one Python string
+        # per distinct value, shared by every row that uses it
+        dictionary = np.array(array.dictionary.to_pylist() + [None], dtype=object)
+        return dictionary[array.indices.fill_null(len(array.dictionary)).to_numpy()]
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _to_frame(table):
+    # dtype is given so pandas keeps object strings instead of converting them
+    columns = {name: _column_values(table.column(name)) for name in table.column_names}
+    return pd.DataFrame({name: pd.Series(values, dtype=values.dtype) for name, values in columns.items()})
+
+
+def _write_table(path, table):
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_frame(path):
+    with pa.memory_map(path) as source:
+        return _to_frame(pa.ipc.open_file(source).read_all())
+
+
+# ---------------------------
+# Save and Load
+# ---------------------------
+def save_snapshot(competition, file_hash, snapshot_dir=SNAPSHOT_DIR):
+    """Write an extract_competition result (all nations) as a snapshot."""
+    path = snapshot_path(file_hash, snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    nations = competition["nations"]
+    meta = {
+        "parser_version": PARSER_VERSION,
+        "kind": competition["kind"],
+        "info": competition["info"],
+        "nations": {
+            nation: {
+                "teams": index["teams"],
+                "fencers": index["fencers"],
+                "stages": list(index["stages"]),
+                "stage_bounds": index["stage_bounds"].tolist(),
+                **{f"{key}_rows": len(index[key]) for key in NATION_FRAMES},
+            }
+            for nation, index in nations.items()
+        },
+    }
+    # Written next to the final directory and renamed into place, so readers
+    # never see half a snapshot
+    staging = tempfile.mkdtemp(dir=snapshot_dir, prefix=".staging-")
+    try:
+        for key in NATION_FRAMES:
+            frames = [index[key] for index in nations.values() if len(index[key])]
+            frame = pd.concat(frames, ignore_index=True) if frames else NATION_FRAMES[key]
+            _write_table(os.path.join(staging, f"{key}.arrow"), _to_table(frame))
+        _write_table(os.path.join(staging, "matches.arrow"), _to_table(pd.DataFrame(
+            [(nation, *match) for nation, index in nations.items() for match in index["matches"]],
+            columns=["nation", "stage", "tableau", "match"],
+        )))
+        _write_table(os.path.join(staging, "teams.arrow"), _to_table(pd.DataFrame(
+            [{"ID": team_id, **team} for team_id, team in competition["team_dict"].items()],
+            columns=["ID", "Team Name", "Nation"],
+        )))
+        _write_table(os.path.join(staging, "fencers.arrow"), _to_table(pd.DataFrame(
+            [{"ID": fencer_id, **fencer} for fencer_id, fencer in competition["fencer_dict"].items()]
+        )))
+        _write_table(os.path.join(staging, "rankings.arrow"), _to_table(competition["final_rankings_df"]))
+        with open(os.path.join(staging, META_FILE), "w") as handle:
+            json.dump(meta, handle)
+        try:
+            os.replace(staging, path)
+        except OSError:
+            pass  # Another process saved the same snapshot first
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return path
+
+
+def _records(frame):
+    return {
+        record.pop("ID"): record
+        for record in frame.to_dict("records")
+    }
+
+
+def load_snapshot(file_hash, snapshot_dir=SNAPSHOT_DIR):
+    """The stored competition for a file hash, or None if there is none."""
+    path = snapshot_path(file_hash, snapshot_dir)
+    try:
+        with open(os.path.join(path, META_FILE)) as handle:
+            meta = json.load(handle)
+        frames = {key: _read_frame(os.path.join(path, f"{key}.arrow")) for key in NATION_FRAMES}
+        matches = _read_frame(os.path.join(path, "matches.arrow"))
+        team_dict = _records(_read_frame(os.path.join(path, "teams.arrow")))
+        fencer_dict = _records(_read_frame(os.path.join(path, "fencers.arrow")))
+        final_rankings_df = _read_frame(os.path.join(path, "rankings.arrow"))
+    except (OSError, ValueError, KeyError, pa.ArrowException):
+        return None  # Missing, from another version or damaged; re-extract
+    if meta.get("parser_version") != PARSER_VERSION:
+        return None
+    try:
+        os.utime(path)  # Last use, for prune_snapshots()
+    except OSError:
+        pass
+
+    match_lists = {nation: [] for nation in meta["nations"]}
+    for nation, stage, tableau, match in zip(*(matches[column].tolist() for column in matches.columns)):
+        match_lists[nation].append((stage, tableau, match))
+    offsets = dict.fromkeys(NATION_FRAMES, 0)
+    nations = {}
+    for nation, stored in meta["nations"].items():
+        index = {
+            "teams": stored["teams"],
+            "fencers": stored["fencers"],
+            "matches": match_lists[nation],
+            "stages": {stage: position for position, stage in enumerate(stored["stages"])},
+            "stage_bounds": np.asarray(stored["stage_bounds"], dtype=np.int64),
+        }
+        for key, empty in NATION_FRAMES.items():
+            start, rows = offsets[key], stored[f"{key}_rows"]
+            index[key] = frames[key].iloc[start:start + rows].reset_index(drop=True) if rows else empty
+            offsets[key] += rows
+        nations[nation] = index
+    return {
+        "kind": meta["kind"],
+        "info": meta["info"],
+        "fencer_dict": fencer_dict,
+        "team_dict": team_dict,
+        "final_rankings_df": final_rankings_df,
+        "nations": nations,
+    }
+
+
+# ---------------------------
+# Eviction
+# ---------------------------
+def _dir_bytes(path):
+    total = 0
+    for entry in os.scandir(path):
+        try:
+            total += entry.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def prune_snapshots(snapshot_dir=SNAPSHOT_DIR, max_bytes=SNAPSHOT_MAX_BYTES, keep=None):
+    """Delete other parser versions' snapshots, then the least recently used
+    until the rest total max_bytes or less; returns the number deleted.
+
+    keep (a snapshot path) is never deleted. Snapshots are ordered by their
+    directory's mtime, which load_snapshot() refreshes on every hit.
+    """
+    suffix = f"-p{PARSER_VERSION}"
+    try:
+        entries = [entry for entry in os.scandir(snapshot_dir)
+                   if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")]
+    except OSError:
+        return 0
+    current = [entry for entry in entries if entry.name.endswith(suffix)]
+    stale = [entry.path for entry in entries if not entry.name.endswith(suffix)]
+    if max_bytes > 0:
+        sized = []
+        for entry in current:
+            try:
+                sized.append((entry.stat().st_mtime, _dir_bytes(entry.path), entry.path))
+            except OSError:
+                pass  # Deleted by another process meanwhile
+        total = sum(size for _, size, _ in sized)
+        for _, size, path in sorted(sized):
+            if total <= max_bytes:
+                break
+            if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+                continue
+            stale.append(path)
+            total -= size
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+    return len(stale)
+
+
+def load_or_extract(data, file_hash=None, snapshot_dir=SNAPSHOT_DIR, timer=NULL_TIMER):
+    """Competition for a results file's bytes, from its snapshot if one exists.
+
+    On a miss the XML is extracted for every nation and a snapshot written.
+    Parse errors propagate as from extract_competition.
+    """
+    file_hash = file_hash or file_digest(data)
+    with timer.stage("load snapshot") as counts:
+        competition = load_snapshot(file_hash, snapshot_dir)
+        counts["hit"] = competition is not None
+    if competition is None:
+        competition = extract_competition(BytesIO(data), timer=timer)
+        with timer.stage("save snapshot"):
+            try:
+                prune_snapshots(snapshot_dir, keep=save_snapshot(competition, file_hash, snapshot_dir))
+            except OSError:
+                pass  # An unwritable snapshot directory only loses the speed-up
+    return competition
+
+
+if __name__ == "__main__":
+    for xml_path in sys.argv[1:]:
+        with open(xml_path, "rb") as handle:
+            xml_data = handle.read()
+        xml_hash = file_digest(xml_data)
+        if load_snapshot(xml_hash) is None:
+            save_snapshot(extract_competition(BytesIO(xml_data)), xml_hash)
+        print(f"{xml_path}: {snapshot_path(xml_hash)}")
+    print(f"pruned {prune_snapshots()} snapshots")
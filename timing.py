@@ -0,0 +1,193 @@
+"""Lightweight per-stage timings for the app and the report pipeline.
+
+Aggregate the JSONL log written by the app with:
+
+    python timing.py [report_timings.jsonl]
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+DEFAULT_LOG_PATH = os.environ.get("REPORT_TIMINGS_LOG", "report_timings.jsonl")
+
+
+def env_enabled():
+    # REPORT_TIMINGS=1 turns timings on by default, e.g. for a debugging session
+    return os.environ.get("REPORT_TIMINGS", "").lower() in ("1", "true", "yes")
+
+
+class _NoopStage:
+    # Returned by disabled timers; counts written to it are discarded
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_STAGE = _NoopStage()
+
+# Timers tracing memory right now, across all sessions of the process.
+# tracemalloc runs while any of them does and is stopped with the last,
+# unless it was already on (e.g. python -X tracemalloc).
+_tracing_lock = threading.Lock()
+_tracing_timers = 0
+_tracing_started = False
+
+
+def _start_tracing():
+    global _tracing_timers, _tracing_started
+    with _tracing_lock:
+        if _tracing_timers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_timers += 1
+
+
+def _stop_tracing():
+    global _tracing_timers, _tracing_started
+    with _tracing_lock:
+        _tracing_timers -= 1
+        if _tracing_timers == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+def _sole_tracer():
+    # The peak is process-wide: it is only read and reset while one timer traces
+    return _tracing_timers == 1
+
+
+# ---------------------------
+# Per-Run Stage Timer
+# ---------------------------
+class StageTimer:
+    """Records wall time, element counts and peak memory per named stage.
+
+    Use ``with timer.stage("parse_xml") as counts:`` and fill ``counts`` with
+    whatever the stage processed. Stages nest; each record keeps its parent's
+    name. A disabled timer hands out one shared no-op context, so wrapping
+    code costs a function call. Memory is the tracemalloc peak of the Python
+    heap (NumPy included, lxml not) and is only traced with
+    ``trace_memory=True``, which slows every allocation while it is on.
+    Call ``stop()`` when the run ends, however it ends, so tracing is
+    switched off again. While another timer is tracing too, peaks are
+    left out (None) rather than mixed with its allocations.
+    """
+
+    def __init__(self, enabled=False, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.records = []
+        self._stack = []
+        self._tracing = False
+
+    @contextmanager
+    def _timed(self, name):
+        counts = {}
+        parent = self._stack[-1] if self._stack else None
+        frame = {"name": name, "peak": 0}
+        if self.trace_memory:
+            if not self._tracing:
+                _start_tracing()
+                self._tracing = True
+            frame["base"] = None
+            if _sole_tracer():
+                current, peak = tracemalloc.get_traced_memory()
+                if parent is not None and parent["base"] is not None:
+                    parent["peak"] = max(parent["peak"], peak - parent["base"])
+                tracemalloc.reset_peak()
+                frame["base"] = current
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            record = {
+                "stage": name,
+                "parent": parent["name"] if parent is not None else None,
+                "seconds": elapsed,
+                "counts": counts,
+            }
+            if self.trace_memory:
+                record["peak_bytes"] = None
+                if frame["base"] is not None and _sole_tracer():
+                    _, peak = tracemalloc.get_traced_memory()
+                    frame["peak"] = max(frame["peak"], peak - frame["base"])
+                    record["peak_bytes"] = frame["peak"]
+                    if parent is not None and parent["base"] is not None:
+                        parent["peak"] = max(parent["peak"], frame["base"] + frame["peak"] - parent["base"])
+            self.records.append(record)
+
+    def stage(self, name):
+        return self._timed(name) if self.enabled else _NOOP_STAGE
+
+    def stop(self):
+        if self._tracing:
+            self._tracing = False
+            _stop_tracing()
+
+    def frame(self):
+        # Records in completion order, children before their parent. pandas is
+        # imported here, as the app's upload page loads this module without it
+        import pandas as pd
+
+        columns = ["stage", "parent", "seconds", "peak_bytes", "counts"]
+        df = pd.DataFrame(self.records, columns=columns)
+        df["counts"] = [", ".join(f"{key}={value}" for key, value in counts.items()) for counts in df["counts"]]
+        return df
+
+    def write_log(self, path=DEFAULT_LOG_PATH, **context):
+        """Append this run as one JSON line; ``context`` adds e.g. file hash."""
+        if not self.records:
+            return
+        line = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), **context,
+                "stages": self.records}
+        with open(path, "a") as handle:
+            handle.write(json.dumps(line, default=str) + "\n")
+
+
+# Shared do-nothing timer for callers that were not given one
+NULL_TIMER = StageTimer(enabled=False)
+
+
+# ---------------------------
+# Log Aggregation
+# ---------------------------
+def read_log(path=DEFAULT_LOG_PATH):
+    """One row per recorded stage across all logged runs."""
+    import pandas as pd
+
+    rows = []
+    with open(path) as handle:
+        for line in handle:
+            run = json.loads(line)
+            context = {key: value for key, value in run.items() if key != "stages"}
+            for record in run["stages"]:
+                rows.append({**context, **record})
+    return pd.DataFrame(rows)
+
+
+def summarise_log(path=DEFAULT_LOG_PATH):
+    # Run count and median / max wall time per stage
+    df = read_log(path)
+    if df.empty:
+        return df
+    return (
+        df.groupby("stage")["seconds"]
+        .agg(runs="count", median="median", max="max")
+        .sort_values("median", ascending=False)
+        .reset_index()
+    )
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    print(summarise_log(log_path).to_string(index=False))
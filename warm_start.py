@@ -0,0 +1,71 @@
+"""Background warm-up of the app's heavy imports.
+
+The app's landing page only needs Streamlit. While a user is picking a
+file, start() imports the extraction stack, pandas' Styler, python-docx
+and the rest in a daemon thread, so the first report run finds them in
+sys.modules. Python's import lock makes a report run that gets there first
+wait for the module being imported rather than import it twice.
+
+Set REPORT_WARM_START=0 to turn it off. See what each step costs with
+
+    python warm_start.py
+"""
+import importlib
+import os
+import threading
+import time
+
+# In the order a report run needs them
+WARM_MODULES = (
+    "app_parse",
+    "app_analyse",
+    "pandas.io.formats.style",
+    "app_export",
+    "live_watch",
+    "word_export",
+)
+
+_lock = threading.Lock()
+_thread = None
+
+
+def env_enabled():
+    return os.environ.get("REPORT_WARM_START", "1").lower() not in ("0", "false", "no")
+
+
+def warm_up():
+    """Import WARM_MODULES and prime python-docx; returns [(step, seconds)]."""
+    timings = []
+    for name in WARM_MODULES:
+        started = time.perf_counter()
+        importlib.import_module(name)
+        timings.append((name, time.perf_counter() - started))
+    # The first Document() parses python-docx's default template; the
+    # template backend's package is read once per process
+    started = time.perf_counter()
+    from docx import Document
+    import docx_template
+
+    Document()
+    docx_template.load_template()
+    timings.append(("docx templates", time.perf_counter() - started))
+    return timings
+
+
+def start():
+    """Start warm_up() in a daemon thread, once per process."""
+    global _thread
+    if not env_enabled():
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warm_up, name="warm-start", daemon=True)
+            _thread.start()
+    return _thread
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    for step, seconds in warm_up():
+        print(f"{step:<26} {seconds:>7.3f}s")
+    print(f"{'total':<26} {time.perf_counter() - started:>7.3f}s")
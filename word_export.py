@@ -0,0 +1,356 @@
+import copy
+import os
+import re
+from io import BytesIO
+from docx import Document
+from docx.shared import Pt, Inches, RGBColor
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+import docx_template
+from extraction import DEFAULT_NATION, ENTRANT_LABELS, REPORT_SECTIONS, nation_names
+from timing import NULL_TIMER
+
+# How the .docx is written (see Report Documents below); REPORT_DOCX_BACKEND
+# picks the default for the app, batch runs and the render service
+WORD_BACKENDS = ("python-docx", "template")
+DEFAULT_BACKEND = os.environ.get("REPORT_DOCX_BACKEND", "python-docx")
+
+HEADER_MAROON = '8A1538'
+LIGHT_MAROON = 'AD5B74'
+WHITE = 'FFFFFF'
+COUNTRY_CELL_FILL = "D9E1F2"
+
+# ---------------------------
+# Table Rendering
+# ---------------------------
+# Tables are created with all their rows up front and every cell is written
+# exactly once from prebuilt property elements. Going through python-docx's
+# table.rows / table.cell / add_row().cells recomputes the whole cell grid on
+# each call, which made large tables quadratic.
+def _xml(fragment):
+    # Declare the w: namespace on the fragment's outermost element
+    return parse_xml(re.sub(r"^<(w:\w+)", rf"<\1 {nsdecls('w')}", fragment))
+
+
+def _shading(fill, clear=False):
+    if clear:
+        return _xml(f'<w:shd w:val="clear" w:color="auto" w:fill="{fill}"/>')
+    return _xml(f'<w:shd w:fill="{fill}"/>')
+
+
+CENTERED = _xml('<w:pPr><w:jc w:val="center"/></w:pPr>')
+HEADER_RUN = _xml('<w:rPr><w:b/><w:color w:val="FFFFFF"/></w:rPr>')
+BLACK_RUN = _xml('<w:rPr><w:color w:val="000000"/></w:rPr>')
+HEADER_SHADING = _shading(HEADER_MAROON)
+BAND_SHADING = {0: _shading(LIGHT_MAROON), 1: _shading(WHITE)}
+
+
+def write_cell(tc, text, paragraph_props=None, run_props=None, shading=None):
+    """Fill an empty table cell in one go; property elements are copied."""
+    if shading is not None:
+        tc.get_or_add_tcPr().append(copy.deepcopy(shading))
+    paragraph = tc.p_lst[0]
+    if paragraph_props is not None:
+        paragraph.insert(0, copy.deepcopy(paragraph_props))
+    run = paragraph.add_r()
+    if run_props is not None:
+        run.insert(0, copy.deepcopy(run_props))
+    run.text = text
+
+
+def add_table(doc, df, striped=False):
+    # Columns are converted to text once each instead of walking df.iterrows()
+    columns = [[str(value) for value in df[col].tolist()] for col in df.columns]
+    num_rows = len(df)
+
+    table = doc.add_table(rows=num_rows + 1, cols=len(df.columns))
+    table.style = 'Table Grid'
+    rows = table._tbl.tr_lst
+
+    # Header row styling
+    for tc, col in zip(rows[0].tc_lst, df.columns):
+        write_cell(tc, str(col), CENTERED, HEADER_RUN, HEADER_SHADING)
+
+    # Data rows, with banded shading and black text when striped
+    for row_idx in range(num_rows):
+        if striped:
+            shading = BAND_SHADING[(row_idx + 1) % 2]
+            run_props = BLACK_RUN
+        else:
+            shading = run_props = None
+        for tc, column in zip(rows[row_idx + 1].tc_lst, columns):
+            write_cell(tc, column[row_idx], CENTERED, run_props, shading)
+    return table
+
+# Create a grid table for "Number of Teams per Country"
+def add_country_team_table(doc, df, columns_per_row=4, font_size=8, background_color=COUNTRY_CELL_FILL):
+    num_rows = (len(df) + columns_per_row - 1) // columns_per_row
+    table = doc.add_table(rows=num_rows, cols=columns_per_row * 2, style="Table Grid")
+    if len(df):
+        run_props = _xml(f'<w:rPr><w:sz w:val="{font_size * 2}"/></w:rPr>')
+        shading = _shading(background_color, clear=True)
+        cells = [tc for tr in table._tbl.tr_lst for tc in tr.tc_lst]
+        texts = {}
+        for idx, (country, count) in enumerate(df.itertuples(index=False)):
+            cell_idx = (idx // columns_per_row) * columns_per_row * 2 + (idx % columns_per_row) * 2
+            texts[cell_idx] = country
+            texts[cell_idx + 1] = str(count)
+        # Every cell of the grid is shaded, including unused trailing ones
+        for cell_idx, tc in enumerate(cells):
+            if cell_idx in texts:
+                write_cell(tc, texts[cell_idx], run_props=run_props, shading=shading)
+            else:
+                tc.get_or_add_tcPr().append(copy.deepcopy(shading))
+    doc.add_paragraph()  # Space after the table
+
+# ---------------------------
+# Word Export Functions with Styling
+# ---------------------------
+def add_heading(doc, text, level=1):
+    heading = doc.add_heading(level=level)
+    run = heading.add_run(text)
+    run.font.size = Pt(16) if level == 1 else Pt(14)
+    heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+# Set paragraph text color to black
+def set_paragraph_text_black(paragraph):
+    for run in paragraph.runs:
+        run.font.color.rgb = RGBColor(0, 0, 0)
+
+# ---------------------------
+# Report Documents
+# ---------------------------
+# export_to_word writes its sections through one of these. Both produce the
+# same document.xml: DocxReport through python-docx objects, TemplateDocxReport
+# as text streamed into a copy of templates/report_template.docx, which is
+# several times faster and lighter on memory for large reports.
+class DocxReport:
+    """python-docx backend."""
+
+    def __init__(self):
+        self.doc = Document()
+        # Set margins
+        for section in self.doc.sections:
+            section.top_margin = Inches(0.5)
+            section.bottom_margin = Inches(0.5)
+            section.left_margin = Inches(0.5)
+            section.right_margin = Inches(0.5)
+
+    def heading(self, text, level=1):
+        add_heading(self.doc, text, level)
+
+    def paragraph(self, text, style=None):
+        set_paragraph_text_black(self.doc.add_paragraph(text, style=style))
+
+    def table(self, df, striped=False):
+        add_table(self.doc, df, striped)
+
+    def country_table(self, df):
+        add_country_team_table(self.doc, df)
+
+    def page_break(self):
+        self.doc.add_page_break()
+
+    def save(self):
+        buffer = BytesIO()
+        self.doc.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+
+# The template backend's markup for the styling above
+TEMPLATE_HEADER_SHADING = docx_template.shading(HEADER_MAROON)
+TEMPLATE_BAND_SHADING = {0: docx_template.shading(LIGHT_MAROON), 1: docx_template.shading(WHITE)}
+TEMPLATE_HEADER_RUN = '<w:rPr><w:b/><w:color w:val="FFFFFF"/></w:rPr>'
+TEMPLATE_BLACK_RUN = '<w:rPr><w:color w:val="000000"/></w:rPr>'
+RUN_CELL_CLOSE = "</w:r>" + docx_template.CELL_CLOSE
+
+
+class TemplateDocxReport(docx_template.TemplateReport):
+    """WordprocessingML backend, in the same styling as DocxReport."""
+
+    def heading(self, text, level=1):
+        size = 32 if level == 1 else 28  # Half-points: 16pt and 14pt
+        run = docx_template.run(text, f'<w:rPr><w:sz w:val="{size}"/></w:rPr>')
+        self.write(f'<w:p><w:pPr><w:pStyle w:val="Heading{level}"/><w:jc w:val="center"/></w:pPr>{run}</w:p>')
+
+    def paragraph(self, text, style=None):
+        # Only the default paragraph style is used; naming it leaves an empty
+        # w:pPr behind in python-docx, as here
+        paragraph_props = "" if style is None else "<w:pPr/>"
+        if text:
+            self.write(f"<w:p>{paragraph_props}{docx_template.run(text, TEMPLATE_BLACK_RUN)}</w:p>")
+        else:
+            self.write(f"<w:p>{paragraph_props}</w:p>" if paragraph_props else docx_template.EMPTY_PARAGRAPH)
+
+    def table(self, df, striped=False):
+        columns = [[str(value) for value in df[col].tolist()] for col in df.columns]
+        start, col_width = docx_template.table_start(len(columns), self.text_width)
+        self.write(start)
+        header = docx_template.cell_open(col_width, TEMPLATE_HEADER_SHADING, docx_template.CENTERED)
+        self._row([header + docx_template.run(str(col), TEMPLATE_HEADER_RUN) + docx_template.CELL_CLOSE
+                   for col in df.columns])
+        if striped:
+            cell_starts = [
+                docx_template.cell_open(col_width, TEMPLATE_BAND_SHADING[band], docx_template.CENTERED)
+                + f"<w:r>{TEMPLATE_BLACK_RUN}"
+                for band in (0, 1)
+            ]
+        else:
+            cell_starts = [docx_template.cell_open(col_width, "", docx_template.CENTERED) + "<w:r>"] * 2
+        for row_idx, values in enumerate(zip(*columns)):
+            cell_start = cell_starts[(row_idx + 1) % 2]
+            self._row([cell_start + docx_template.run_content(value) + RUN_CELL_CLOSE for value in values])
+        self.write("</w:tbl>")
+
+    def country_table(self, df, columns_per_row=4, font_size=8, background_color=COUNTRY_CELL_FILL):
+        cols = columns_per_row * 2
+        start, col_width = docx_template.table_start(cols, self.text_width)
+        self.write(start)
+        shading = docx_template.shading(background_color, clear=True)
+        cell_start = docx_template.cell_open(col_width, shading) + f'<w:r><w:rPr><w:sz w:val="{font_size * 2}"/></w:rPr>'
+        empty_cell = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/>{shading}</w:tcPr><w:p/></w:tc>'
+        texts = []
+        for country, count in df.itertuples(index=False):
+            texts.extend((country, str(count)))
+        # Every cell of the grid is shaded, including unused trailing ones
+        for row_start in range(0, len(texts), cols):
+            row = [cell_start + docx_template.run_content(text) + RUN_CELL_CLOSE for text in texts[row_start:row_start + cols]]
+            self._row(row + [empty_cell] * (cols - len(row)))
+        self.write("</w:tbl>")
+        self.write(docx_template.EMPTY_PARAGRAPH)  # Space after the table
+
+    def _row(self, cells):
+        self.write("<w:tr>" + "".join(cells) + "</w:tr>" if cells else "<w:tr/>")
+
+    def page_break(self):
+        self.write(docx_template.PAGE_BREAK)
+
+
+def new_report(backend=DEFAULT_BACKEND, template=docx_template.TEMPLATE_PATH):
+    if backend == "template":
+        return TemplateDocxReport(template)
+    if backend == "python-docx":
+        return DocxReport()
+    raise ValueError(f"Unknown Word backend {backend!r}; expected one of {', '.join(WORD_BACKENDS)}")
+
+
+# Overview page: competition details, the nation's fencers and entrant counts
+def add_overview(report, overview_data, nation_fencers_df, team_count_df, nation=DEFAULT_NATION, entrants="Teams"):
+    report.heading("Competition Overview", level=1)
+    overview_text = (
+        f"{overview_data['Year']} - {overview_data['Tournament']} - {overview_data['Championship']}\n"
+        f"Date: {overview_data['Date']}, Location: {overview_data['Location']}\n"
+        f"Category: {overview_data['Category']}, Weapon: {overview_data['Weapon']}, Gender: {overview_data['Gender']}\n"
+        f"Number of {entrants}: {overview_data['Num Teams']}, Number of Countries: {overview_data['Num Countries']}"
+    )
+    report.paragraph(overview_text)
+
+    # Target Nation Fencers Participating Section
+    nation_adjective = nation_names(nation)[1]
+    if not nation_fencers_df.empty:
+        report.heading(f"{nation_adjective} Fencers Participating", level=2)
+        report.table(nation_fencers_df, striped=True)
+
+    # Number of Teams (or Fencers) per Country Section
+    report.heading(f"Number of {entrants} per Country", level=2)
+    report.country_table(team_count_df)
+
+# ---------------------------
+# Export to Word Document Function
+# ---------------------------
+def export_to_word(overview_data, nation_fencers_df, team_count_df, tables_data, nation_summary, final_rankings_df,
+                   progress=None, nation=DEFAULT_NATION, timer=NULL_TIMER, sections=REPORT_SECTIONS,
+                   poule_indicators=None, entrants="Teams", backend=DEFAULT_BACKEND,
+                   template=docx_template.TEMPLATE_PATH):
+    # progress, if given, is called as progress(fraction, text) between sections.
+    # Individual events pass their poule indicators and entrants="Fencers".
+    # backend is one of WORD_BACKENDS; template is the .docx the "template"
+    # backend writes into.
+    def report_progress(fraction, text):
+        if progress is not None:
+            progress(fraction, text=text)
+
+    # Every section after the first starts on a new page
+    started = False
+
+    def start_section(name):
+        nonlocal started
+        if name not in sections:
+            return False
+        if started:
+            report.page_break()
+        started = True
+        return True
+
+    report = new_report(backend, template)
+
+    # Competition Overview Section
+    if start_section("overview"):
+        add_overview(report, overview_data, nation_fencers_df, team_count_df, nation, entrants)
+
+    # Tables Overview Section
+    if start_section("tables"):
+        report_progress(0.1, "Adding stage tables...")
+        report.heading("Tables Overview", level=1)
+        table_count = 0
+        with timer.stage("docx: stage tables") as counts:
+            for stage, table_data in tables_data.items():
+                if table_count % 2 == 0 and table_count > 0:
+                    report.page_break()
+                report.table(table_data, striped=True)
+                table_count += 1
+                report_progress(0.1 + 0.6 * table_count / len(tables_data), f"Added stage {stage}")
+            counts.update(tables=table_count, rows=sum(len(table_data) for table_data in tables_data.values()))
+
+    # Review Section
+    if start_section("review"):
+        report_progress(0.7, "Adding fencer review...")
+        nation_adjective = nation_names(nation)[1]
+        report.heading(f"Review - Accumulated Touches and Match Outcomes for {nation_adjective} Fencers", level=1)
+        with timer.stage("docx: review") as counts:
+            if poule_indicators is not None and not poule_indicators.empty:
+                report.heading("Poule Indicators", level=2)
+                report.table(poule_indicators, striped=True)
+            for fencer_data in nation_summary:
+                fencer_text = (
+                    f"Fencer: {fencer_data['Fencer']}\n"
+                    f"Scored: {fencer_data['Scored']}, Conceded: {fencer_data['Conceded']}, Total: {fencer_data['Total']}\n"
+                )
+                report.paragraph(fencer_text, style="Normal")
+                if not fencer_data['Outcomes'].empty:
+                    report.table(fencer_data['Outcomes'], striped=True)
+            counts["fencers"] = len(nation_summary)
+
+    # Final Rankings Section
+    if start_section("rankings"):
+        report_progress(0.85, "Adding final rankings...")
+        report.heading("Final Rankings", level=1)
+        report.table(final_rankings_df, striped=True)
+
+    report_progress(0.95, "Saving document...")
+    with timer.stage("docx: save") as counts:
+        buffer = report.save()
+        counts["bytes"] = len(buffer.getbuffer())
+    return buffer
+
+def export_competition_report(competition, summary, overview_data, progress=None, timer=NULL_TIMER,
+                              sections=REPORT_SECTIONS, backend=DEFAULT_BACKEND):
+    # Convenience wrapper over export_to_word for extract_competition output
+    return export_to_word(
+        overview_data=overview_data,
+        nation_fencers_df=summary["nation_fencers_df"],
+        team_count_df=summary["team_count_df"],
+        tables_data=summary["tables_data"],
+        nation_summary=summary["nation_summary"],
+        final_rankings_df=competition["final_rankings_df"],
+        progress=progress,
+        nation=summary["nation"],
+        timer=timer,
+        sections=sections,
+        poule_indicators=summary.get("poule_indicators"),
+        entrants=ENTRANT_LABELS[summary.get("kind", "team")],
+        backend=backend
+    )
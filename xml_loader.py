@@ -0,0 +1,251 @@
+import codecs
+import itertools
+import os
+import re
+import xml.etree.ElementTree as ET
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+
+# Elements the pull parser reports; everything else is only seen as children
+RECORD_TAGS = ("Equipe", "Match", "Tableau")
+# Individual events list fencers directly and their matches have no relay legs
+INDIVIDUAL_ROOT = "CompetitionIndividuelle"
+INDIVIDUAL_RECORD_TAGS = ("Tireur", "Match")
+
+# First element name, skipping the XML declaration, comments and DOCTYPE
+ROOT_TAG = re.compile(rb"<([A-Za-z_][\w.:-]*)")
+
+# Anything outside printable ASCII (plus tabs and newlines) is dropped, the same
+# rule the old whole-document parse_xml applied to the decoded string. Every
+# byte of a multi-byte UTF-8 sequence is >= 0x80, so deleting raw bytes
+# removes exactly the same characters without decoding the whole file.
+NON_PRINTABLE_BYTES = bytes(
+    b for b in range(256) if not (0x20 <= b <= 0x7E or b in b"\t\n\r")
+)
+
+
+# ---------------------------
+# Chunked Byte Cleaning
+# ---------------------------
+def iter_clean_chunks(source, chunk_size=CHUNK_SIZE):
+    """Yield cleaned byte chunks from a path or binary file-like object."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as handle:
+            yield from iter_clean_chunks(handle, chunk_size)
+        return
+
+    # Decoding is only used to reject files that are not valid UTF-8, the
+    # decoded text itself is thrown away.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    started = False
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        decoder.decode(chunk)
+        chunk = chunk.translate(None, NON_PRINTABLE_BYTES)
+        if not started:
+            # Leading whitespace before the XML declaration is a parse error
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        yield chunk
+    decoder.decode(b"", final=True)
+
+
+# ---------------------------
+# Streaming Record Iterator
+# ---------------------------
+def _match_teams(match):
+    teams = {}
+    for equipe in match.iter("Equipe"):
+        teams.setdefault(equipe.get("Cote"), equipe.get("REF"))
+    return teams
+
+
+def _match_record(match, teams, stage_title, tableau_id):
+    bouts = []
+    for assaut in match.iter("Assaut"):
+        sides = {}
+        for tireur in assaut.iter("Tireur"):
+            sides.setdefault(tireur.get("Cote"), tireur)
+        fencer_d = sides.get("D")
+        fencer_g = sides.get("G")
+        bouts.append((
+            assaut.get("ID"),
+            fencer_d.get("REF") if fencer_d is not None else None,
+            int(fencer_d.get("Score", 0)) if fencer_d is not None else 0,
+            fencer_g.get("REF") if fencer_g is not None else None,
+            int(fencer_g.get("Score", 0)) if fencer_g is not None else 0,
+        ))
+    return {
+        "stage": stage_title,
+        "tableau": tableau_id,
+        "attrib": dict(match.attrib),
+        "teams": teams,
+        "bouts": bouts,
+    }
+
+
+def _detach(elem):
+    # Drop the element's content and every already-consumed sibling before it
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _enclosing(elem, tag):
+    for ancestor in elem.iterancestors(tag):
+        return ancestor
+    return None
+
+
+def _poule_stage(poule):
+    # "Poule 3", or "Round 2 - Poule 3" after the first round of poules
+    round_id = poule.getparent().get("ID") if poule.getparent() is not None else None
+    title = f"Poule {poule.get('ID')}"
+    return title if round_id in (None, "1") else f"Round {round_id} - {title}"
+
+
+def _bout_record(match, stage_title, group_id, phase):
+    # One individual bout: [(fencer ref, score, status)] for both fencers
+    fencers = [
+        (tireur.get("REF"), int(tireur.get("Score")), tireur.get("Statut"))
+        for tireur in match.iterchildren("Tireur")
+    ]
+    return {
+        "stage": stage_title,
+        "tableau": group_id,
+        "phase": phase,
+        "attrib": dict(match.attrib),
+        "fencers": fencers,
+    }
+
+
+def _individual_records(elem, bout_filter):
+    # Records of one reported element of a CompetitionIndividuelle file;
+    # returns False for elements that must stay attached to their parent
+    tag = elem.tag
+    parent = elem.getparent()
+    if tag == "Tireur":
+        if parent is None or parent.tag != "Tireurs":
+            return False  # Part of a poule or match, read with it
+        return [("fencer", dict(elem.attrib))]
+    poule = parent if parent is not None and parent.tag == "Poule" else None
+    if poule is not None:
+        stage, group_id, phase = _poule_stage(poule), poule.get("ID"), "poule"
+    else:
+        tableau = _enclosing(elem, "Tableau")
+        if tableau is None or _enclosing(tableau, "SuiteDeTableaux") is None:
+            return []
+        stage, group_id, phase = tableau.get("Titre", "Unknown Stage"), tableau.get("ID"), "tableau"
+    tireurs = list(elem.iterchildren("Tireur"))
+    # Byes have one fencer and unfenced bouts no scores yet
+    if len(tireurs) != 2 or any(tireur.get("Score") is None for tireur in tireurs):
+        return []
+    if bout_filter is not None and not bout_filter([tireur.get("REF") for tireur in tireurs]):
+        return []
+    return [("bout", _bout_record(elem, stage, group_id, phase))]
+
+
+def iter_competition(source, chunk_size=CHUNK_SIZE, match_filter=None, bout_filter=None):
+    """Stream an Ophardt results file as compact records.
+
+    Yields ``(kind, data)`` tuples where kind is one of ``"competition"``
+    (root attributes), ``"team"``, ``"ranking"`` or ``"match"`` for team
+    events, and ``"competition"``, ``"fencer"`` or ``"bout"`` (one poule or
+    DE bout) for individual events. The lxml pull parser only reports the
+    tags records are built from, and elements are detached from the tree as
+    soon as they have been turned into a record, so only the chain of
+    currently open ancestors is held in memory.
+    ``match_filter``, if given, is called with a team match's ``{"D": ref,
+    "G": ref}`` team references and matches it rejects are skipped before
+    their bouts are read; ``bout_filter`` likewise with the list of fencer
+    references of an individual bout.
+    Raises ``UnicodeDecodeError`` or ``ET.ParseError`` like ``ET.fromstring``.
+    """
+    chunks = iter_clean_chunks(source, chunk_size)
+    first_chunk = next(chunks, b"")
+    root_tag = ROOT_TAG.search(first_chunk)
+    individual = root_tag is not None and root_tag.group(1).decode() == INDIVIDUAL_ROOT
+    parser = etree.XMLPullParser(
+        events=("end",), tag=INDIVIDUAL_RECORD_TAGS if individual else RECORD_TAGS,
+        resolve_entities=False, no_network=True
+    )
+    root_seen = False
+
+    def drain():
+        nonlocal root_seen
+        for _, elem in parser.read_events():
+            if not root_seen:
+                root_seen = True
+                yield "competition", dict(elem.getroottree().getroot().attrib)
+
+            tag = elem.tag
+            if individual:
+                records = _individual_records(elem, bout_filter)
+                if records is False:
+                    continue
+                yield from records
+            elif tag == "Equipe":
+                parent = elem.getparent()
+                if parent is not None and parent.tag == "Match":
+                    # Part of a match record, consumed when the Match closes
+                    continue
+                if elem.get("ID"):
+                    yield "team", {
+                        "attrib": dict(elem.attrib),
+                        "fencers": [dict(t.attrib) for t in elem.iter("Tireur")],
+                    }
+                elif elem.get("REF") and elem.get("RangFinal") and _enclosing(elem, "PhaseDeTableaux") is not None:
+                    yield "ranking", dict(elem.attrib)
+            elif tag == "Match":
+                tableau = _enclosing(elem, "Tableau")
+                if tableau is not None and _enclosing(tableau, "SuiteDeTableaux") is not None:
+                    teams = _match_teams(elem)
+                    if match_filter is None or match_filter(teams):
+                        yield "match", _match_record(
+                            elem, teams, tableau.get("Titre", "Unknown Stage"), tableau.get("ID")
+                        )
+            _detach(elem)
+
+    try:
+        for chunk in itertools.chain([first_chunk], chunks):
+            parser.feed(chunk)
+            yield from drain()
+        root = parser.close()
+        yield from drain()
+    except etree.XMLSyntaxError as e:
+        raise ET.ParseError(str(e)) from e
+    if not root_seen:
+        yield "competition", dict(root.attrib)
+
+
+def parse_match(data, stage_title, tableau_id):
+    """Build a match record from the bytes of one cleaned <Match> element.
+
+    Used to re-read single matches of a file that is being rewritten; the
+    record has the same shape as the ones iter_competition yields.
+    """
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    try:
+        match = etree.fromstring(data, parser)
+    except etree.XMLSyntaxError as e:
+        raise ET.ParseError(str(e)) from e
+    return _match_record(match, _match_teams(match), stage_title, tableau_id)
+
+
+def load_competition(source, chunk_size=CHUNK_SIZE):
+    """Collect the streamed records of a results file into one dict."""
+    competition = {"info": {}, "teams": [], "rankings": [], "matches": [], "fencers": [], "bouts": []}
+    lists = {"team": "teams", "ranking": "rankings", "match": "matches", "fencer": "fencers", "bout": "bouts"}
+    for kind, data in iter_competition(source, chunk_size):
+        if kind == "competition":
+            competition["info"] = data
+        else:
+            competition[lists[kind]].append(data)
+    return competition